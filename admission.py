@@ -0,0 +1,82 @@
+"""
+Admission control for upstream AI calls.
+
+AdmissionController caps the number of upstream calls in flight per process;
+callers beyond the cap wait in a bounded queue that is served round-robin
+across sessions, so one busy session cannot starve the others. Requests that cannot be admitted fail fast
+with Busy instead of slowing everyone down.
+"""
+import collections
+import threading
+import time
+from typing import Optional
+
+
+class Busy(Exception):
+    """Not admitted; `reason` is "queue_full" or "timeout", `waited` the seconds spent queued."""
+
+    def __init__(self, reason: str, waited: float = 0.0):
+        super().__init__(f"upstream busy ({reason})")
+        self.reason = reason
+        self.waited = waited
+
+
+class _Waiter:
+    __slots__ = ("event", "granted")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class AdmissionController:
+    def __init__(self, max_inflight: int = 8, max_queue: int = 32, queue_timeout: float = 10.0):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.inflight = 0
+        self.queued = 0
+        self._waiting = collections.OrderedDict()  # session -> deque of waiters, in round-robin order
+        self._lock = threading.Lock()
+
+    def acquire(self, session: str, timeout: Optional[float] = None) -> float:
+        """Take an upstream slot for `session`, queueing if none is free. Returns the seconds waited; raises Busy."""
+        with self._lock:
+            if self.inflight < self.max_inflight and not self.queued:
+                self.inflight += 1
+                return 0.0
+            if self.queued >= self.max_queue:
+                raise Busy("queue_full")
+            waiter = _Waiter()
+            self._waiting.setdefault(session, collections.deque()).append(waiter)
+            self.queued += 1
+        start = time.monotonic()
+        waiter.event.wait(self.queue_timeout if timeout is None else timeout)
+        waited = time.monotonic() - start
+        with self._lock:
+            if waiter.granted:
+                return waited
+            queue = self._waiting[session]
+            queue.remove(waiter)
+            if not queue:
+                del self._waiting[session]
+            self.queued -= 1
+        raise Busy("timeout", waited)
+
+    def release(self) -> None:
+        """Give the slot back, or hand it straight to the next session in line."""
+        with self._lock:
+            if not self._waiting:
+                self.inflight -= 1
+                return
+            session, queue = self._waiting.popitem(last=False)
+            waiter = queue.popleft()
+            if queue:
+                self._waiting[session] = queue  # back of the line
+            self.queued -= 1
+            waiter.granted = True
+            waiter.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"inflight": self.inflight, "queued": self.queued, "sessions_waiting": len(self._waiting)}
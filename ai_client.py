@@ -0,0 +1,60 @@
+"""
+OpenAI client construction.
+
+Clients are meant to be built once per process (assistant.py wraps these in
+resources.shared) so every session reuses the same keep-alive connection pool.
+Every request has a connect/read timeout, and failed requests are retried a
+bounded number of times with the SDK's jittered exponential backoff.
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+# Seconds; `read` also bounds the gap between two streamed chunks
+TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+MAX_RETRIES = 2
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+
+def make_client(api_key: str) -> OpenAI:
+    return OpenAI(
+        api_key=api_key,
+        timeout=TIMEOUT,
+        max_retries=MAX_RETRIES,
+        http_client=DefaultHttpxClient(limits=POOL_LIMITS),
+    )
+
+
+def make_async_client(api_key: str) -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key=api_key,
+        timeout=TIMEOUT,
+        max_retries=MAX_RETRIES,
+        http_client=DefaultAsyncHttpxClient(limits=POOL_LIMITS),
+    )
+
+
+class AsyncRunner:
+    """
+    A private event loop on a daemon thread.
+    AsyncOpenAI's connection pool is tied to one loop, so all async calls go
+    through this loop instead of a fresh asyncio.run() per script rerun.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="ai-async-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run `coro` on the loop and block the calling thread until it finishes."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
@@ -0,0 +1,88 @@
+"""
+Process-wide answer cache for the AI assistant.
+
+One instance is shared by every Streamlit session (see get_answer_cache in assistant.py).
+Entries are evicted least-recently-used once `max_entries` is reached and expire
+after `ttl` seconds. An optional StateStore (state.py) shares answers between
+worker processes and keeps them across restarts; this cache stays in front of it.
+"""
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+def normalize_question(question: str) -> str:
+    """Case/whitespace-insensitive form of a question, used for cache keys."""
+    return re.sub(r"\s+", " ", question or "").strip().lower()
+
+
+def cache_key(question: str, model: str, version: str) -> str:
+    return f"{version}|{model}|{normalize_question(question)}"
+
+
+class AnswerCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 24 * 3600, store=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()  # key -> (stored_at, answer)
+        self._lock = threading.Lock()
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str, count: bool = True) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+        if item is None and self._store is not None:
+            # Read the backend (a network round trip for Redis) without holding up other lookups
+            raw = self._store.get("answers", key)
+            if raw is not None:
+                item = tuple(json.loads(raw))
+        with self._lock:
+            if item is not None and now - item[0] > self.ttl:
+                self._drop(key)
+                item = None
+            if item is None:
+                if count:
+                    self.misses += 1
+                return None
+            self._put(key, item)  # most recently used (and back in memory if it came from the store)
+            if count:
+                self.hits += 1
+            return item[1]
+
+    def set(self, key: str, answer: str, stored_at: Optional[float] = None) -> None:
+        """Cache `answer`; `stored_at` backdates it, so a copy of an older answer expires with the original."""
+        now = time.time()
+        item = (now if stored_at is None else stored_at, answer)
+        with self._lock:
+            self._put(key, item)
+        if self._store is not None:
+            self._store.set("answers", key, json.dumps(item), ttl=max(1.0, self.ttl - (now - item[0])))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _put(self, key: str, item: tuple) -> None:
+        self._items[key] = item
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def _drop(self, key: str) -> None:
+        self._items.pop(key, None)
+        if self._store is not None:
+            self._store.delete("answers", key)
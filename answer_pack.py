@@ -0,0 +1,71 @@
+"""
+Answer packs: precomputed answers shipped with a deploy.
+
+File layout (little-endian):
+    magic  b"FHPACK01"
+    u32    entry count
+    u32    metadata length, then that many bytes of JSON metadata
+    index  count x (u64 key hash, u64 offset, u32 length), sorted by hash
+    data   UTF-8 answers
+
+The app memory-maps the file and binary-searches the index, so loading is
+instant and the answers are shared between processes through the page cache.
+"""
+import hashlib
+import json
+import mmap
+import struct
+import time
+from typing import Optional
+
+import numpy as np
+
+MAGIC = b"FHPACK01"
+_INDEX = np.dtype([("hash", "<u8"), ("offset", "<u8"), ("length", "<u4")])
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
+def write_pack(path: str, answers: dict, meta: dict) -> None:
+    """Write `answers` ({cache key: answer}) and `meta` to `path`."""
+    meta = {**meta, "built_at": time.time(), "entries": len(answers)}
+    meta_bytes = json.dumps(meta, sort_keys=True).encode()
+    items = sorted((_hash(k), v.encode()) for k, v in answers.items())
+    index = np.zeros(len(items), dtype=_INDEX)
+    offset = 0
+    for i, (h, data) in enumerate(items):
+        index[i] = (h, offset, len(data))
+        offset += len(data)
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<II", len(items), len(meta_bytes)))
+        f.write(meta_bytes)
+        f.write(index.tobytes())
+        for _, data in items:
+            f.write(data)
+
+
+class AnswerPack:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != MAGIC:
+            raise ValueError(f"{path} is not an answer pack")
+        count, meta_len = struct.unpack_from("<II", self._mm, 8)
+        start = 16 + meta_len
+        self.meta = json.loads(self._mm[16:start])
+        self._index = np.frombuffer(self._mm, dtype=_INDEX, count=count, offset=start)
+        self._data = start + count * _INDEX.itemsize
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str) -> Optional[str]:
+        h = _hash(key)
+        i = int(np.searchsorted(self._index["hash"], h))
+        if i == len(self._index) or int(self._index["hash"][i]) != h:
+            return None
+        start = self._data + int(self._index["offset"][i])
+        return self._mm[start:start + int(self._index["length"][i])].decode()
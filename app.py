@@ -1,9 +1,12 @@
-import os
-import re
+import threading
 from pathlib import Path
 
 import streamlit as st
-from openai import OpenAI
+
+import settings
+import startup
+from assets import AssetManager
+from static_page import CONTENT_HASH, compile_page
 
 # --------------------------------------------------
 # Page config
@@ -15,575 +18,125 @@ st.set_page_config(page_title="FinanceHub", page_icon="💳", layout="wide")
 # --------------------------------------------------
 if "show_ai" not in st.session_state:
     st.session_state.show_ai = False
-if "chat" not in st.session_state:
-    st.session_state.chat = []
 
 # --------------------------------------------------
-# OpenAI config
+# AI assistant (assistant.py), loaded the first time someone opens it
 # --------------------------------------------------
-api_key = st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
-if not api_key:
-    st.error("Missing OPENAI_API_KEY. Add it in Streamlit Secrets.")
-    st.stop()
+# Load it in the background at startup instead, so the first click is fast (AI_WARMUP=1)
+WARMUP = settings.flag("AI_WARMUP")
+# Print an import-time breakdown of the first load to stderr (AI_STARTUP_REPORT=1)
+STARTUP_REPORT = settings.flag("AI_STARTUP_REPORT")
 
-client = OpenAI(api_key=api_key)
-MODEL = st.secrets.get("OPENAI_CHAT_MODEL", os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"))
+def _record_startup(module, stages: dict) -> None:
+    for stage, seconds in stages.items():
+        module.telemetry.observe("ai_startup_seconds", seconds, stage=stage)
 
-# --------------------------------------------------
-# Styling (WalletHub-like typography + colors)
-# --------------------------------------------------
-st.markdown(
+def load_assistant():
     """
-<style>
-/* --- Page --- */
-section.main { background: #f6f7fb; }
-
-/* --- Top nav --- */
-.topbar{
-  background:#201535; padding:14px 18px; border-radius:12px; color:white;
-  display:flex; justify-content:space-between; align-items:center; margin-bottom:20px;
-}
-.brand{ font-weight:800; font-size:16px; display:flex; gap:10px; align-items:center; }
-.brand-badge{
-  width:26px; height:26px; border-radius:6px; background:#2dd4bf;
-  display:inline-flex; align-items:center; justify-content:center;
-  font-weight:900; color:#0b1020;
-}
-.nav{ font-size:13px; opacity:.95; display:flex; gap:14px; align-items:center; }
-.pill{ background:#2f2350; padding:7px 12px; border-radius:999px; display:inline-block; }
+    The AI subsystem, imported and initialized once per process. The memo lives in startup.load, not here:
+    this script re-runs on every interaction, and the ai-warmup thread has no ScriptRunContext.
+    """
+    return startup.load("assistant", report=STARTUP_REPORT, on_load=_record_startup)[0]
 
-/* --- Hero --- */
-.hero-wrap{ padding:8px 6px 6px 6px; }
-.hero-title{
-  font-family:Georgia,"Times New Roman",serif; font-size:72px; font-weight:700;
-  line-height:.98; color:#0f172a; margin:0;
-}
-.hero-sub{ font-size:16px; color:#475569; margin-top:14px; max-width:620px; }
-.hero-cta-row{ margin-top:16px; display:flex; gap:12px; align-items:center; flex-wrap:wrap; }
-.note{ font-size:12px; color:#64748b; margin-top:10px; }
+@st.cache_resource
+def start_warmup() -> threading.Thread:
+    t = threading.Thread(target=load_assistant, name="ai-warmup", daemon=True)
+    t.start()
+    return t
 
-/* --- New: AI helper text above button --- */
-.ai-helper{
-  font-size:13px;
-  color:#475569;
-  margin-top:10px;
-  max-width:620px;
-}
-.ai-helper b{ color:#0f172a; }
+if WARMUP:
+    start_warmup()
 
-/* --- Video card --- */
-.video-card{
-  background:#5b77f4; border-radius:18px; height:240px;
-  display:flex; align-items:center; justify-content:center;
-  color:white; font-size:26px; font-weight:800;
-  border:1px solid rgba(0,0,0,.05);
-}
+# --------------------------------------------------
+# Static page blocks (compiled once per process, see static_page.py)
+# --------------------------------------------------
+@st.cache_resource
+def get_page_blocks(content_hash: str) -> dict:
+    return compile_page(content_hash)
 
-/* --- Outcomes strip --- */
-.outcomes-wrap{
-  background:white;
-  border:1px solid #ececf3;
-  border-radius:22px;
-  padding:22px;
-  margin-top:18px;
-}
-.outcomes-grid{
-  display:grid;
-  grid-template-columns:repeat(4,1fr);
-  gap:16px;
-}
-@media (max-width:900px){
-  .outcomes-grid{ grid-template-columns:repeat(2,1fr); }
-}
-@media (max-width:500px){
-  .outcomes-grid{ grid-template-columns:1fr; }
-}
-.outcome-card{
-  background:#f6f7fb;
-  border-radius:18px;
-  padding:18px;
-}
-.outcome-value{
-  font-size:28px;
-  font-weight:900;
-  color:#0f172a;
-}
-.outcome-label{
-  font-size:14px;
-  color:#475569;
-  margin-top:6px;
-}
+PAGE = get_page_blocks(CONTENT_HASH)
 
-/* --- Sections --- */
-.section-card{
-  background:white; border:1px solid #ececf3; border-radius:22px;
-  padding:22px; margin-top:18px;
-}
-.section-kicker{
-  font-size:12px; letter-spacing:.14em; color:#64748b; font-weight:800;
-}
-.section-title{
-  font-family:Georgia,"Times New Roman",serif; font-size:54px; font-weight:700;
-  line-height:1.02; color:#0f172a; margin:8px 0 10px 0; white-space:pre-line;
-}
-.feature{ margin-top:14px; }
-.feature b{ font-size:16px; font-weight:700; color:#0f172a; }
-.feature .desc{ margin-left:18px; margin-top:4px; color:#475569; font-size:14px; }
-.linkish{ color:#2563eb; font-weight:700; margin-top:14px; }
+# Styling (WalletHub-like typography + colors)
+st.markdown(PAGE["style"], unsafe_allow_html=True)
 
-/* --- AI sidebar card (multi-color) --- */
-.ai-card{
-  background:linear-gradient(135deg,#eef2ff 0%, #f0fdf4 50%, #fff7ed 100%);
-  border:1px solid #e5e7eb; border-radius:16px; padding:14px; margin-bottom:12px;
-}
-.ai-title{ font-size:18px; font-weight:900; color:#0f172a; margin:0 0 6px 0; }
-.ai-desc{ font-size:13px; color:#334155; line-height:1.45; margin:0; }
-.ai-highlight{ color:#2563eb; font-weight:900; }
-.ai-note{ font-size:12px; color:#64748b; margin-top:8px; }
+# --------------------------------------------------
+# Assets (files in static/, resolved once per process, see assets.py)
+# --------------------------------------------------
+@st.cache_resource
+def get_assets() -> AssetManager:
+    return AssetManager(Path(__file__).parent / "static")
 
-/* --- End-page deals section (WalletHub-like) --- */
-.deals-wrap{ margin-top:34px; padding:10px 0 6px 0; }
-.deals-kicker{
-  font-size:12px; letter-spacing:.14em; color:#0f172a; font-weight:800; text-align:center;
-}
-.deals-title{
-  font-family:Georgia,"Times New Roman",serif; font-size:64px; font-weight:700;
-  line-height:1.03; color:#0f172a; text-align:center; margin-top:8px;
-}
-.deals-sub{
-  font-size:15px; color:#475569; text-align:center;
-  max-width:720px; margin:12px auto 0 auto;
-}
-.deals-grid{
-  max-width:980px; margin:24px auto 0 auto;
-  display:grid; grid-template-columns:repeat(3, 1fr); gap:18px;
-}
-@media (max-width:900px){ .deals-grid{ grid-template-columns:repeat(2, 1fr); } }
-@media (max-width:600px){ .deals-grid{ grid-template-columns:1fr; } }
-.deal-card{
-  background:#f3f5f9; border:1px solid #edf0f6; border-radius:22px;
-  padding:18px 14px; height:150px;
-  display:flex; flex-direction:column; justify-content:center; align-items:center;
-}
-.deal-icon{
-  width:54px; height:54px; border-radius:18px; background:white;
-  border:1px solid #e7eaf2;
-  display:flex; align-items:center; justify-content:center;
-  font-size:28px; margin-bottom:10px;
-}
-.deal-label{ font-size:20px; color:#0f172a; font-weight:500; }
-.deals-cta{ display:flex; justify-content:center; margin-top:22px; }
-.wallethub-btn button{
-  background:#201535 !important; color:white !important;
-  border-radius:999px !important; padding:0.65rem 1.6rem !important;
-  font-weight:700 !important; border:none !important;
-}
-</style>
-""",
-    unsafe_allow_html=True,
-)
+ASSETS = get_assets()
 
 # --------------------------------------------------
 # Helpers
 # --------------------------------------------------
-def _cap_to_4_sentences(text: str) -> str:
-    if not text:
-        return text
-    t = re.sub(r"\s+", " ", text).strip()
-    parts = re.split(r"(?<=[.!?])\s+", t)
-    capped = " ".join(parts[:4]).strip()
-    if capped == t and len(parts) <= 1 and len(capped) > 420:
-        capped = capped[:420].rsplit(" ", 1)[0] + "…"
-    return capped
-
-def _natural_segment(text: str) -> str:
-    if not text:
-        return text
-    s = re.sub(r"\s+", " ", text).strip()
-    s = re.sub(
-        r"\s-\s+(Budgeting|Credit|Offers|Investments|Identity)\s*:",
-        r"\n\n- \1:",
-        s,
-        flags=re.I,
-    )
-    sentences = re.split(r"(?<=[.!?])\s+", s)
-    blocks, current = [], ""
-    for sent in sentences:
-        sent = sent.strip()
-        if not sent:
-            continue
-        if sent.startswith("- "):
-            if current:
-                blocks.append(current.strip())
-                current = ""
-            blocks.append(sent)
-            continue
-        current = (current + " " + sent).strip() if current else sent
-        if len(re.split(r"(?<=[.!?])\s+", current)) >= 2:
-            blocks.append(current.strip())
-            current = ""
-    if current:
-        blocks.append(current.strip())
-    out = "\n\n".join(blocks)
-    out = re.sub(r"\n{3,}", "\n\n", out).strip()
-    return out
-
 def pdf_download(path: str, label: str):
     """
     Add a PDF download button.
-    Put your PDF in the same folder as this app and set `path` to its filename,
+    Put your PDF in the static/ folder next to this app and set `path` to its filename,
     e.g. "advanced_financial_guide.pdf".
+    The button is a plain link to Streamlit's static route, so the file is only sent when clicked.
     """
-    p = Path(path)
-    if p.exists():
-        with open(p, "rb") as f:
-            st.download_button(
-                label=label,
-                data=f,
-                file_name=p.name,
-                mime="application/pdf",
-                use_container_width=True,
-            )
+    asset = ASSETS.get(path)
+    if asset is None:
+        st.info(f"PDF not found: {Path(path).name}. Add it to the static/ folder to enable download.")
+    elif st.get_option("server.enableStaticServing"):
+        st.link_button(label, asset.url, use_container_width=True)
     else:
-        st.info(f"PDF not found: {p.name}. Add it to the app folder to enable download.")
-
-# --------------------------------------------------
-# AI (short + includes section links)
-# --------------------------------------------------
-def ask_ai(question: str) -> str:
-    prompt = f"""
-You are a friendly AI onboarding assistant for a finance app UI.
-
-Your role:
-- Help users understand what this app offers
-- Explain financial concepts in plain, simple English
-- Gently guide users without giving rigid steps
-- Never claim access to personal or private data
-
-Important rules:
-- The answer MUST be no more than 4 sentences total.
-- Keep it short and helpful (no long explanations).
-- If you mention an app area, include a clickable Markdown link to it:
-  Budgeting -> [Budgeting & Spending](#budgeting)
-  Credit -> [Improve your credit & save](#credit)
-  Offers -> [Offers](#offers)
-  Investments -> [Investments](#investments)
-  Identity -> [Identity](#identity)
-- Do NOT use labeled sections (no "Overview:", etc).
-- If the question is vague, ask ONE short clarifying question (still within 4 sentences).
-
-Context:
-This app includes budgeting, credit education, offers comparison, investments tracking, and identity protection.
-It is for learning and navigation only (no login, no private data).
-
-User question:
-{question}
-
-Respond naturally like a helpful product guide, in Markdown.
-"""
-    try:
-        r = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": "You are a helpful, calm onboarding assistant."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.6,
+        st.download_button(
+            label=label,
+            data=asset.read(),
+            file_name=asset.name,
+            mime=asset.mime,
+            use_container_width=True,
         )
-        raw = r.choices[0].message.content.strip()
-        capped = _cap_to_4_sentences(raw)
-        return _natural_segment(capped)
-    except Exception:
-        return "Sorry — I ran into a temporary issue. Please try again."
-
-def push_chat(q: str):
-    st.session_state.chat.append(("You", q))
-    st.session_state.chat.append(("AI", ask_ai(q)))
 
 # --------------------------------------------------
 # Sidebar: AI Assistant (button-activated)
 # --------------------------------------------------
 if st.session_state.show_ai:
-    with st.sidebar:
-        img_candidates = ["ai_assistant.png", "picture.png", "picture.jpg", "picture.jpeg", "picture.webp"]
-        img_path = next((p for p in img_candidates if Path(p).exists()), None)
-        if img_path:
-            st.image(img_path, use_container_width=True)
-
-        st.markdown(
-            """
-<div class="ai-card">
-  <div class="ai-title">AI Assistant</div>
-  <p class="ai-desc">
-    Hi! I am your <span class="ai-highlight">AI assistant</span>.<br/>
-    Ask questions about this app, explore features, and get simple explanations in plain English.
-  </p>
-  <div class="ai-note">
-    No login • No private data • You decide when to use AI
-  </div>
-</div>
-""",
-            unsafe_allow_html=True,
-        )
-
-        if st.button("Close AI Assistant", use_container_width=True):
-            st.session_state.show_ai = False
-            st.rerun()
-
-        st.divider()
-        st.caption("Example prompts (click to try):")
-
-        c1, c2 = st.columns(2)
-        if c1.button("60-sec tour", use_container_width=True):
-            push_chat("Give me a very short 60-second tour of this app. Where should a new user start?")
-        if c2.button("Where should I start?", use_container_width=True):
-            push_chat("Where should I start?")
-
-        if st.button("Explain credit score", use_container_width=True):
-            push_chat("Explain what a credit score is in simple English.")
-
-        st.divider()
-
-        for role, msg in st.session_state.chat[-10:]:
-            st.markdown(f"**{role}:**")
-            st.markdown(msg)
-
-        user_q = st.text_input("Ask a question", placeholder="Type your question here…")
-        if st.button("Send", type="primary", use_container_width=True) and user_q.strip():
-            push_chat(user_q.strip())
+    load_assistant().render_sidebar(ASSETS)
 
 # --------------------------------------------------
 # Top bar
 # --------------------------------------------------
-st.markdown(
-    """
-<div class="topbar">
-  <div class="brand"><span class="brand-badge">W</span> FinanceHub</div>
-  <div class="nav">
-    <span>MyHub</span>
-    <span>Credit Cards</span>
-    <span>Loans</span>
-    <span>Banking</span>
-    <span>Pros</span>
-    <span class="pill">Login</span>
-    <span class="pill">Sign Up</span>
-  </div>
-</div>
-""",
-    unsafe_allow_html=True,
-)
+st.markdown(PAGE["topbar"], unsafe_allow_html=True)
 
 # --------------------------------------------------
 # Hero
 # --------------------------------------------------
 left, right = st.columns([1.25, 1])
 with left:
-    st.markdown('<div class="hero-wrap">', unsafe_allow_html=True)
-    st.markdown('<p class="hero-title">Supercharge<br/>Your Finances</p>', unsafe_allow_html=True)
-    st.markdown(
-        '<div class="hero-sub">FinanceHub helps you make the most of your money. '
-        'Strengthen your credit, budget better, track offers, monitor investments, and protect your identity — all in one place.</div>',
-        unsafe_allow_html=True,
-    )
-
-    st.markdown(
-        '<div class="ai-helper"><b>AI-Assisted Onboarding:</b> Our optional AI assistant helps new users '
-        'understand financial concepts, explains features in context, and guides exploration in simple, plain English.</div>',
-        unsafe_allow_html=True,
-    )
-
-    st.markdown('<div class="hero-cta-row">', unsafe_allow_html=True)
+    st.markdown(PAGE["hero"], unsafe_allow_html=True)
     st.button("Get Started for Free", type="primary")
     if st.button("Ask AI Assistant"):
         st.session_state.show_ai = True
         st.rerun()
-    st.markdown("</div>", unsafe_allow_html=True)
     st.markdown('<div class="note">AI is optional: education + navigation (no login, no private data).</div>', unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
 
 with right:
     st.markdown('<div class="video-card">Meet FinanceHub ▶</div>', unsafe_allow_html=True)
     st.caption("Placeholder for an intro video (optional).")
 
 # --------------------------------------------------
-# Key Financial Outcomes (Improvement 1)
-# --------------------------------------------------
-st.markdown(
-    """
-<div class="outcomes-wrap">
-  <div class="section-kicker">KEY FINANCIAL OUTCOMES</div>
-  <div class="outcomes-grid">
-    <div class="outcome-card">
-      <div class="outcome-value">$ Saved</div>
-      <div class="outcome-label">
-        Discover potential annual savings through better credit cards,
-        loans, and spending decisions.
-      </div>
-    </div>
-    <div class="outcome-card">
-      <div class="outcome-value">+ Credit</div>
-      <div class="outcome-label">
-        Track and improve your credit score over time with monitoring
-        and guided plans.
-      </div>
-    </div>
-    <div class="outcome-card">
-      <div class="outcome-value">↓ Risk</div>
-      <div class="outcome-label">
-        Reduce financial risk with identity monitoring, alerts,
-        and theft protection.
-      </div>
-    </div>
-    <div class="outcome-card">
-      <div class="outcome-value">Net Worth</div>
-      <div class="outcome-label">
-        See your full financial picture by tracking assets,
-        debts, and investments in one place.
-      </div>
-    </div>
-  </div>
-</div>
-""",
-    unsafe_allow_html=True,
-)
-
-# --------------------------------------------------
-# Section builder (NOW WITH ANCHOR IDS)
-# --------------------------------------------------
-def section(section_id: str, kicker: str, title: str, features: list, footer: str = "View all features →"):
-    st.markdown(f'<div id="{section_id}"></div>', unsafe_allow_html=True)
-    st.markdown('<div class="section-card">', unsafe_allow_html=True)
-    st.markdown(f'<div class="section-kicker">{kicker}</div>', unsafe_allow_html=True)
-    st.markdown(f'<div class="section-title">{title}</div>', unsafe_allow_html=True)
-    for name, desc in features:
-        st.markdown(
-            f'<div class="feature"><b>＋ {name}</b><div class="desc">{desc}</div></div>',
-            unsafe_allow_html=True,
-        )
-    st.markdown(f'<div class="linkish">{footer}</div>', unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-# --------------------------------------------------
-# Main sections (WITH IDS)
+# Key Financial Outcomes (Improvement 1) + main sections (WITH IDS)
 # --------------------------------------------------
-section(
-    "budgeting",
-    "BUDGETING & SPENDING",
-    "Make your money\nwork for you",
-    [
-        ("Budgeting Tool", "Create a budget and take control of your spending."),
-        ("Spending Tracker", "Monitor spending habits and identify potential savings."),
-        ("Subscription Manager", "Effortlessly manage subscriptions and cancel what you no longer need."),
-        ("WalletScore", "A simple score to summarize your financial habits (high-level)."),
-    ],
-)
-
-section(
-    "credit",
-    "CREDIT",
-    "Improve your\ncredit & save",
-    [
-        ("Credit Scores & Reports", "Understand your score and how it changes over time."),
-        ("Credit Builder", "Steps and tools to help strengthen credit history."),
-        ("Credit Report Monitoring", "Alerts for important changes and potential issues."),
-        ("Credit Lock", "Reduce the risk of new credit being opened without you."),
-        ("Credit Improvement Plan", "A guided checklist to improve score drivers."),
-        ("Debt Payoff Plan", "A plan to reduce debt with clear milestones."),
-    ],
-)
-
-section(
-    "offers",
-    "OFFERS",
-    "Personalized offers\nfor your credit",
-    [
-        ("Personalized Credit Card Offers", "Find cards that fit goals like cash back or low APR."),
-        ("Pre-qualified Personal Loans", "Explore loan options without heavy searching."),
-        ("Savings Opportunities", "Discover ways to lower interest, fees, or recurring costs."),
-    ],
-)
-
-section(
-    "investments",
-    "INVESTMENTS",
-    "Monitor and track\nyour investments",
-    [
-        ("Investment Monitoring", "Track investment performance and changes over time."),
-        ("News Feed", "A focused feed that highlights what matters."),
-        ("Retirement Planning", "Plan targets based on timeline and lifestyle goals."),
-        ("Net Worth", "Track assets and liabilities over time."),
-    ],
-)
-
-section(
-    "identity",
-    "IDENTITY",
-    "Protect your\nidentity",
-    [
-        ("Dark Web Monitoring", "Get notified if your information appears in common leak sources."),
-        ("Identity Theft Insurance", "Coverage support if identity theft occurs (summary)."),
-        ("Identity Monitoring", "Alerts for suspicious activity involving identity and accounts."),
-    ],
-)
+st.markdown(PAGE["outcomes"], unsafe_allow_html=True)
+st.markdown(PAGE["sections"], unsafe_allow_html=True)
 
 # --------------------------------------------------
 # Advanced resources + PDF Download (Improvement 4)
 # --------------------------------------------------
-st.markdown('<div class="section-card">', unsafe_allow_html=True)
-st.markdown('<div class="section-kicker">ADVANCED USERS</div>', unsafe_allow_html=True)
-st.markdown(
-    '<div class="section-title">Download detailed\nfinancial insights</div>',
-    unsafe_allow_html=True,
-)
-st.markdown(
-    '<div class="hero-sub">'
-    'For users who want deeper analysis, detailed explanations, and methodology, '
-    'we provide optional downloadable resources without cluttering the main interface.'
-    '</div>',
-    unsafe_allow_html=True,
-)
+st.markdown(PAGE["advanced"], unsafe_allow_html=True)
 
-# Put your PDF in the same folder as this script (example filename below)
+# Put your PDF in the static/ folder next to this script (example filename below)
 pdf_download("advanced_financial_guide.pdf", "Download Advanced Financial Guide (PDF)")
-st.markdown("</div>", unsafe_allow_html=True)
 
 # --------------------------------------------------
 # End page: "Find the Best Deals"
 # --------------------------------------------------
-st.markdown('<div class="deals-wrap">', unsafe_allow_html=True)
-st.markdown('<div class="deals-kicker">SAVINGS OPPORTUNITIES</div>', unsafe_allow_html=True)
-st.markdown('<div class="deals-title">Find the Best Deals</div>', unsafe_allow_html=True)
-st.markdown(
-    '<div class="deals-sub">People trust FinanceHub because of its user reviews, unbiased recommendations, '
-    'and transparent rating logic designed to help you compare options confidently.</div>',
-    unsafe_allow_html=True
-)
-
-cards = [
-    ("💳", "Credit Cards"),
-    ("💰", "Personal Loans"),
-    ("🚗", "Car Insurance"),
-    ("🐷", "Savings Accounts"),
-    ("🏦", "Checking Accounts"),
-    ("📈", "CDs"),
-]
-
-st.markdown('<div class="deals-grid">', unsafe_allow_html=True)
-for icon, label in cards:
-    st.markdown(
-        f"""
-        <div class="deal-card">
-          <div class="deal-icon">{icon}</div>
-          <div class="deal-label">{label}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-st.markdown("</div>", unsafe_allow_html=True)
-
-st.markdown('<div class="deals-cta wallethub-btn">', unsafe_allow_html=True)
+st.markdown(PAGE["deals"], unsafe_allow_html=True)
 st.button("View All FinanceHub Awards")
-st.markdown("</div>", unsafe_allow_html=True)
-st.markdown("</div>", unsafe_allow_html=True)
 
 st.caption("Demo UI + optional AI-assisted onboarding. Educational only. No login and no private user data.")
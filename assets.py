@@ -0,0 +1,77 @@
+"""
+Static assets (the PDF guide, the sidebar image), resolved once per process.
+
+The files live in static/ and Streamlit serves them itself at app/static/<name>
+(server.enableStaticServing in .streamlit/config.toml), with ETag and Range
+support, on the app's own host and port. Each file is fingerprinted when first
+found and the page only sends its URL; the fingerprint in the query string lets
+browsers cache it for good. Where static serving is turned off, the bytes are
+read once and handed to Streamlit instead.
+"""
+import hashlib
+import mimetypes
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import quote
+
+# Where Streamlit serves the static/ folder, relative to the app's own URL
+STATIC_ROUTE = "app/static"
+
+
+class Asset:
+    __slots__ = ("name", "path", "size", "mime", "etag", "_data")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = path.name
+        self.mime = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self.size = path.stat().st_size
+        digest = hashlib.blake2b(digest_size=12)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self.etag = digest.hexdigest()
+        self._data = None
+
+    @property
+    def url(self) -> str:
+        """Fingerprinted URL under Streamlit's static route."""
+        return f"{STATIC_ROUTE}/{quote(self.name)}?v={self.etag}"
+
+    def read(self) -> bytes:
+        """The file's bytes, read on first use and kept (only needed without static serving)."""
+        if self._data is None:
+            self._data = self.path.read_bytes()
+        return self._data
+
+
+class AssetManager:
+    def __init__(self, root: Path, miss_ttl: float = 30.0):
+        """Names resolve relative to `root`; a missing file is looked for again after `miss_ttl` seconds."""
+        self.root = Path(root)
+        self.miss_ttl = miss_ttl
+        self._assets = {}  # name -> Asset
+        self._missing = {}  # name -> time it was last looked for
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[Asset]:
+        asset = self._assets.get(name)
+        if asset is not None:
+            return asset
+        with self._lock:
+            asset = self._assets.get(name)
+            if asset is not None or time.monotonic() - self._missing.get(name, -self.miss_ttl) < self.miss_ttl:
+                return asset
+            path = self.root / name
+            if not path.is_file():
+                self._missing[name] = time.monotonic()
+                return None
+            asset = self._assets[name] = Asset(path)
+            self._missing.pop(name, None)
+            return asset
+
+    def first(self, names: Iterable[str]) -> Optional[Asset]:
+        """The first of `names` that exists."""
+        return next((a for a in map(self.get, names) if a is not None), None)
@@ -0,0 +1,927 @@
+"""
+The AI assistant: answering, caching, admission control and the sidebar chat.
+
+app.py loads this module lazily (startup.load) the first time a visitor opens
+the assistant, so the landing page never pays for importing the OpenAI stack.
+Its process-wide objects are built with resources.shared rather than
+st.cache_resource, because they are also reached from the assistant's own
+threads, which have no ScriptRunContext.
+"""
+import asyncio
+import contextlib
+import itertools
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import streamlit as st
+from openai import AsyncOpenAI, OpenAI
+
+import metrics
+import settings
+from admission import AdmissionController, Busy
+from ai_client import AsyncRunner, make_async_client, make_client
+from answer_cache import AnswerCache, cache_key
+from answer_pack import AnswerPack
+from assets import AssetManager
+from breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from catalog import SECTION_LINKS, SECTIONS
+from chat_history import ChatHistory
+from context import RollingSummary, build_context, count_tokens
+from hedge import HedgeBudget, LatencyTracker, arace, race
+from models import pick_model
+from postprocess import StreamingAnswer, format_answer
+from prefetch import Prefetcher, predict
+from prompt import PREFIX_HASH, PROMPT_VERSION, build_messages, build_summary_messages, prompt_tokens
+from resources import shared
+from router import IntentRouter
+from semantic_cache import SemanticCache
+from sessions import SessionRegistry
+from singleflight import SingleFlight
+from state import StateStore, open_backend
+
+# Chat messages shown per "page" in the sidebar
+CHAT_PAGE = 10
+
+# --------------------------------------------------
+# State backend (chat history, answer cache, rate limits; see state.py)
+# --------------------------------------------------
+# sqlite:///path.db or redis://host:port/db share state between workers; AI_CACHE_PATH is the older SQLite setting
+STATE_URL = settings.get("AI_STATE_URL")
+CACHE_PATH = settings.get("AI_CACHE_PATH")
+
+@shared
+def get_state_store(url: str) -> StateStore:
+    """One store per process; writes are batched in the background."""
+    return StateStore(open_backend(url))
+
+store = get_state_store(STATE_URL or (f"sqlite:///{CACHE_PATH}" if CACHE_PATH else "memory://"))
+# Chats and answers are only written through to a shared backend; an in-process (memory://) copy would just
+# duplicate them. Rate-limit counters always use the store. Stored chats expire AI_CHAT_TTL seconds after their
+# last turn
+SHARED_STORE = store if store.shared else None
+CHAT_TTL = float(settings.get("AI_CHAT_TTL", str(7 * 24 * 3600)))
+# Keep the session id in the URL (?sid=...), so a reload or another worker resumes the conversation.
+# Off by default: anyone given a link that carries the id can read and continue that conversation
+SID_IN_URL = settings.flag("AI_SID_IN_URL")
+
+# --------------------------------------------------
+# OpenAI config
+# --------------------------------------------------
+api_key = settings.get("OPENAI_API_KEY")
+
+@shared
+def get_client(key: str) -> OpenAI:
+    """One pooled client per process instead of one per script rerun."""
+    return make_client(key)
+
+@shared
+def get_async_client(key: str) -> AsyncOpenAI:
+    return make_async_client(key)
+
+@shared
+def get_async_runner() -> AsyncRunner:
+    return AsyncRunner()
+
+MODEL = settings.get("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+# Stream answers into the sidebar as they are generated (set AI_STREAM=0 to disable)
+STREAM = settings.flag("AI_STREAM", True)
+# Precomputed answers built by build_answer_pack.py, served before calling the API
+ANSWER_PACK = settings.get("AI_ANSWER_PACK", "answer_pack.bin")
+# Send recent chat turns (plus a rolling summary of older ones) with each question (set AI_MULTI_TURN=1)
+MULTI_TURN = settings.flag("AI_MULTI_TURN")
+# Hard cap on input tokens per multi-turn request
+CONTEXT_BUDGET = 1500
+# Share of a question's terms a catalog feature must match before it is answered locally
+ROUTER_THRESHOLD = 0.5
+# Paraphrase cache: max entries, and the cosine similarity that counts as "same question"
+SEMANTIC_CAPACITY = 20_000
+SEMANTIC_THRESHOLD = 0.9
+# How long a generated answer is served from the caches (seconds)
+ANSWER_TTL = 24 * 3600
+# Hot-path instrumentation (AI_METRICS=1); AI_METRICS_PORT also serves Prometheus text at /metrics
+METRICS_PORT = settings.get("AI_METRICS_PORT")
+METRICS = bool(METRICS_PORT) or settings.flag("AI_METRICS")
+# Longest a session waits on an identical in-flight question before giving up (seconds)
+WAIT_TIMEOUT = 60.0
+# Admission control: upstream calls in flight per process, callers allowed to queue for one, and for how long (seconds)
+MAX_INFLIGHT = int(settings.get("AI_MAX_INFLIGHT", "8"))
+MAX_QUEUE = 32
+QUEUE_TIMEOUT = 10.0
+# Per-session rate limit: questions per minute, and how many may come back to back (within 10 seconds)
+SESSION_RATE = 10
+SESSION_BURST = 5
+# Model routing: short, simple questions go to AI_FAST_MODEL when it is set
+FAST_MODEL = settings.get("AI_FAST_MODEL")
+FAST_MAX_TOKENS = 16
+# Hedging: a duplicate request fires once a call runs past this percentile of the model's recent latencies;
+# hedges never exceed AI_HEDGE_RATIO of requests (0 disables them)
+HEDGE_PERCENTILE = 95
+HEDGE_RATIO = float(settings.get("AI_HEDGE_RATIO", "0.05"))
+# Circuit breaker: opens when, over the last BREAKER_WINDOW seconds (at least BREAKER_MIN_CALLS calls), half the
+# upstream calls failed or took over BREAKER_SLOW_CALL seconds; probes upstream again after BREAKER_OPEN_FOR seconds
+BREAKER_WINDOW = 60.0
+BREAKER_MIN_CALLS = 10
+BREAKER_SLOW_CALL = 10.0
+BREAKER_OPEN_FOR = 30.0
+# While it is open, the answer to a cached question this close is shown, labelled with that question
+DEGRADED_THRESHOLD = 0.75
+# Session lifecycle: a session's chat is released after AI_SESSION_IDLE_TTL seconds without a run, or sooner,
+# longest-idle first, while all sessions together hold more than AI_SESSION_MEMORY_MB (0: no cap).
+# AI_SESSION_EVICT=spill keeps released chats in the state backend for the next visit; "evict" discards them.
+# Spilling into memory:// would free nothing, so without a shared backend chats are always evicted
+SESSION_IDLE_TTL = float(settings.get("AI_SESSION_IDLE_TTL", "900"))
+SESSION_MEMORY_MB = float(settings.get("AI_SESSION_MEMORY_MB", "0"))
+SESSION_EVICT = settings.get("AI_SESSION_EVICT", "spill")
+SESSION_SWEEP = 30.0
+# Seconds between memory estimates of one session (each walks its state)
+SESSION_SAMPLE = float(settings.get("AI_SESSION_SAMPLE", "30"))
+# Speculative prefetch: after each answer, suggest and precompute the AI_PREFETCH_K likeliest follow-ups (0 disables),
+# spending at most AI_PREFETCH_RATIO upstream calls per question asked (by default one per four questions, so
+# speculation adds at most a quarter to upstream spend). Off with AI_MULTI_TURN, whose answers depend on the
+# conversation and are never served from the cache
+PREFETCH_K = 0 if MULTI_TURN else int(settings.get("AI_PREFETCH_K", "3"))
+PREFETCH_RATIO = float(settings.get("AI_PREFETCH_RATIO", "0.25"))
+PREFETCH_WORKERS = 2
+
+PRESET_PROMPTS = {
+    "60-sec tour": "Give me a very short 60-second tour of this app. Where should a new user start?",
+    "Where should I start?": "Where should I start?",
+    "Explain credit score": "Explain what a credit score is in simple English.",
+}
+
+telemetry = metrics.registry
+
+def _collect_stats() -> None:
+    """Counts the caches, breaker and admission controller keep themselves, for /metrics."""
+    for name, cache in (("answers", get_answer_cache()), ("semantic", get_semantic_cache(MODEL, PROMPT_VERSION))):
+        stats = cache.stats()
+        telemetry.set("ai_cache_entries", stats["entries"], cache=name)
+        telemetry.set("ai_cache_lookups", stats["hits"], cache=name, result="hit")
+        telemetry.set("ai_cache_lookups", stats["misses"], cache=name, result="miss")
+    breaker = get_breaker().stats()
+    for result, key in (("total", "calls"), ("failed", "failed"), ("slow", "slow")):
+        telemetry.set("ai_breaker_window_calls", breaker[key], result=result)
+    admission = get_admission().stats()
+    telemetry.set("ai_admission_slots", admission["inflight"], state="inflight")
+    telemetry.set("ai_admission_slots", admission["queued"], state="queued")
+
+@shared
+def start_metrics_server(port: int):
+    # Admin views: the sessions holding the most memory, and whether prefetching pays off
+    return metrics.serve(telemetry, port, views={"/sessions": session_report, "/prefetch": lambda: get_prefetcher().stats()})
+
+# --------------------------------------------------
+# Answering (short + includes section links)
+# --------------------------------------------------
+AI_ERROR = "Sorry — I ran into a temporary issue. Please try again."
+AI_BUSY = "I'm handling a lot of questions right now — please try again in a few seconds."
+AI_SLOW_DOWN = "You're asking faster than I can keep up — give me a few seconds, then try again."
+AI_DEGRADED = "The assistant is in limited mode for a moment, so here's a quick pointer. {suggestion}"
+AI_DEGRADED_MATCH = (
+    "The assistant is in limited mode for a moment. It can't answer new questions right now, "
+    'but here is its answer to a related one, "{question}":\n\n{answer}'
+)
+DEGRADED_FALLBACK = (
+    "A good first stop is [Budgeting & Spending](#budgeting) to see where your money goes, "
+    "and [Improve your credit & save](#credit) explains what moves your score."
+)
+
+class EmptyAnswer(Exception):
+    """Upstream finished without any answer text; never cached, answered with AI_ERROR."""
+
+@shared
+def get_answer_cache() -> AnswerCache:
+    """One answer cache per process, shared by every session."""
+    return AnswerCache(max_entries=2048, ttl=ANSWER_TTL, store=SHARED_STORE)
+
+def _answer_key(question: str) -> str:
+    return cache_key(question, MODEL, PROMPT_VERSION)
+
+@shared
+def get_semantic_cache(model: str, prompt_version: str) -> SemanticCache:
+    """Near-duplicate lookup for paraphrased questions; one per model + prompt version."""
+    return SemanticCache(capacity=SEMANTIC_CAPACITY, threshold=SEMANTIC_THRESHOLD, ttl=ANSWER_TTL)
+
+@shared
+def get_answer_pack(path: str):
+    """
+    Prebuilt answers (build_answer_pack.py), memory-mapped.
+    None if the pack is missing, was built with --mock, or was built for another model or prompt version.
+    """
+    if not path or not Path(path).exists():
+        return None
+    pack = AnswerPack(path)
+    if pack.meta.get("model") != MODEL or pack.meta.get("prompt_version") != PROMPT_VERSION:
+        return None
+    if pack.meta.get("mock"):  # built with --mock: placeholder text, never for real users
+        return None
+    return pack
+
+def _recall(question: str, key: str):
+    """Cached answer for `question`: exact match, then the answer pack, then the closest paraphrase."""
+    cache = get_answer_cache()
+    answer = cache.get(key)
+    if answer is not None:
+        telemetry.inc("ai_answers_total", source="cache")
+        _claim_prefetch(answer)
+        return answer
+    pack = get_answer_pack(ANSWER_PACK)
+    answer = pack.get(key) if pack is not None else None
+    source, stored_at = "pack", None
+    if answer is None:
+        entry = get_semantic_cache(MODEL, PROMPT_VERSION).lookup_entries([question])[0]
+        _, answer, stored_at = entry or (None, None, None)
+        source = "semantic"
+    if answer is not None:
+        telemetry.inc("ai_answers_total", source=source)
+        _claim_prefetch(answer)
+        # A paraphrase hit expires with the answer it reuses, not ANSWER_TTL from now
+        cache.set(key, answer, stored_at=stored_at)
+    return answer
+
+def _remember(question: str, key: str, answer: str) -> None:
+    get_answer_cache().set(key, answer)
+    get_semantic_cache(MODEL, PROMPT_VERSION).add(question, answer)
+
+@shared
+def get_inflight() -> SingleFlight:
+    """Registry of in-flight AI calls, so identical concurrent questions share one upstream request."""
+    return SingleFlight()
+
+@shared
+def get_admission() -> AdmissionController:
+    """Process-wide cap on upstream calls in flight, with a fair queue in front of it."""
+    return AdmissionController(max_inflight=MAX_INFLIGHT, max_queue=MAX_QUEUE, queue_timeout=QUEUE_TIMEOUT)
+
+@contextlib.contextmanager
+def upstream_slot(session: str):
+    """Hold one upstream slot for `session`; raises Busy if none frees up in time."""
+    admission = get_admission()
+    try:
+        waited = admission.acquire(session)
+    except Busy as e:
+        telemetry.inc("ai_admission_total", outcome=e.reason)
+        telemetry.observe("ai_queue_seconds", e.waited)
+        raise
+    telemetry.inc("ai_admission_total", outcome="admitted")
+    telemetry.observe("ai_queue_seconds", waited)
+    try:
+        yield
+    finally:
+        admission.release()
+
+BREAKER_STATES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+@shared
+def get_breaker() -> CircuitBreaker:
+    """Process-wide circuit breaker over upstream calls; its state is exported as ai_breaker_state."""
+    def on_change(old: str, new: str):
+        telemetry.set("ai_breaker_state", BREAKER_STATES[new])
+        telemetry.inc("ai_breaker_transitions_total", to=new)
+
+    telemetry.set("ai_breaker_state", BREAKER_STATES[CLOSED])
+    return CircuitBreaker(
+        window=BREAKER_WINDOW,
+        min_calls=BREAKER_MIN_CALLS,
+        slow_call=BREAKER_SLOW_CALL,
+        open_for=BREAKER_OPEN_FOR,
+        on_change=on_change,
+    )
+
+@contextlib.contextmanager
+def upstream_call(session: str):
+    """
+    Guard one upstream call: the circuit breaker (CircuitOpen while it is open), then an admission slot.
+    Checking the breaker first means an open circuit fails fast instead of queueing for a slot it won't use.
+    """
+    breaker = get_breaker()
+    if not breaker.allow():
+        raise CircuitOpen("upstream circuit is open")
+    with contextlib.ExitStack() as stack:
+        try:
+            stack.enter_context(upstream_slot(session))
+        except BaseException:
+            breaker.record(None, 0.0)  # never went upstream: only give back a half-open probe
+            raise
+        stack.enter_context(breaker.call(allowed=True))
+        yield
+
+def degraded_answer(question: str) -> str:
+    """
+    Local answer while the circuit is open: a looser paraphrase match, else the closest catalog feature.
+    The looser match can be a different question (raise vs lower a score), so it is labelled with the question it
+    answered rather than passed off as an answer to this one.
+    """
+    telemetry.inc("ai_answers_total", source="degraded")
+    entry = get_semantic_cache(MODEL, PROMPT_VERSION).lookup_entries([question], threshold=DEGRADED_THRESHOLD)[0]
+    if entry is not None:
+        return AI_DEGRADED_MATCH.format(question=entry[0], answer=entry[1])
+    return AI_DEGRADED.format(suggestion=get_router().suggest(question) or DEGRADED_FALLBACK)
+
+def admit_question() -> bool:
+    """
+    Per-session rate limit on questions: a token bucket of SESSION_BURST refilled at SESSION_RATE per minute,
+    kept in the state store so the limit holds whichever worker serves the session.
+    """
+    if store.take("rate", st.session_state.session_id, SESSION_RATE / 60, SESSION_BURST):
+        return True
+    telemetry.inc("ai_admission_total", outcome="rate_limited")
+    return False
+
+def _record_usage(usage) -> None:
+    if usage is not None:
+        telemetry.inc("ai_tokens_total", usage.prompt_tokens, kind="prompt", source="api")
+        telemetry.inc("ai_tokens_total", usage.completion_tokens, kind="completion", source="api")
+        # Prompt tokens served from the provider's prefix cache (billed and processed at a discount)
+        details = getattr(usage, "prompt_tokens_details", None)
+        telemetry.inc("ai_tokens_total", getattr(details, "cached_tokens", None) or 0, kind="cached", source="api")
+
+def _record_prompt(messages: list, model: str) -> None:
+    """Local token counts per prompt part (prefix, context, question)."""
+    if telemetry.enabled:
+        for part, n in prompt_tokens(messages, model).items():
+            telemetry.inc("ai_prompt_tokens_total", n, part=part)
+
+def _record_error(e: BaseException) -> None:
+    telemetry.inc("ai_errors_total", type=type(e).__name__)
+    telemetry.inc("ai_answers_total", source="error")
+
+def _error_reply(e: BaseException, question: str) -> str:
+    """What the user sees when answering `question` failed with `e`."""
+    if isinstance(e, Busy):
+        return AI_BUSY
+    if isinstance(e, CircuitOpen):
+        return degraded_answer(question)
+    _record_error(e)
+    return AI_ERROR
+
+def _model_for(question: str, messages: list = None) -> str:
+    # A follow-up with conversation context ("what about the second one?") is only short on its own
+    model = MODEL if messages is not None else pick_model(question, MODEL, FAST_MODEL, FAST_MAX_TOKENS)
+    telemetry.inc("ai_model_requests_total", model=model)
+    return model
+
+@shared
+def get_latency(kind: str, model: str) -> LatencyTracker:
+    """Recent upstream latencies per model: full completions, or time to first token for streams."""
+    return LatencyTracker()
+
+@shared
+def get_hedge_budget() -> HedgeBudget:
+    """Process-wide cap on hedged duplicates: at most HEDGE_RATIO of upstream requests."""
+    return HedgeBudget(ratio=HEDGE_RATIO)
+
+@shared
+def get_hedge_pool() -> ThreadPoolExecutor:
+    """Threads for hedged stream openings (up to two attempts per in-flight call)."""
+    return ThreadPoolExecutor(max_workers=2 * MAX_INFLIGHT, thread_name_prefix="ai-hedge")
+
+def _record_hedge(hedged) -> None:
+    if hedged is not None:
+        telemetry.inc("ai_hedges_total", outcome="won" if hedged else "lost")
+
+async def _acomplete(messages: list, model: str):
+    """One completion, hedged once it runs past the model's HEDGE_PERCENTILE latency."""
+    latency = get_latency("completion", model)
+    start = time.perf_counter()
+    r, hedged = await arace(
+        lambda: get_async_client(api_key).chat.completions.create(model=model, messages=messages, temperature=0.6),
+        latency.percentile(HEDGE_PERCENTILE),
+        get_hedge_budget(),
+    )
+    latency.add(time.perf_counter() - start)
+    _record_hedge(hedged)
+    return r
+
+def _fetch_answer(question: str, messages: list = None) -> str:
+    return get_async_runner().run(_afetch_answer(question, messages), timeout=WAIT_TIMEOUT)
+
+async def _afetch_answer(question: str, messages: list = None) -> str:
+    with telemetry.timer("ai_stage_seconds", stage="prompt"):
+        model = _model_for(question, messages)
+        messages = messages or build_messages(question)
+        _record_prompt(messages, model)
+    with telemetry.timer("ai_stage_seconds", stage="upstream"):
+        r = await _acomplete(messages, model)
+    _record_usage(r.usage)
+    telemetry.inc("ai_answers_total", source="upstream")
+    with telemetry.timer("ai_stage_seconds", stage="postprocess"):
+        return _nonempty(format_answer((r.choices[0].message.content or "").strip()))
+
+def _nonempty(answer: str) -> str:
+    if not answer:
+        raise EmptyAnswer("upstream returned no answer text")
+    return answer
+
+def _open_stream(messages: list, model: str):
+    """Start a streamed completion and read up to its first chunk: (stream, remaining chunks, first chunk or None)."""
+    stream = get_client(api_key).chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=0.6,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    chunks = iter(stream)
+    try:
+        for chunk in chunks:
+            if chunk.choices:
+                return stream, chunks, chunk
+    except BaseException:
+        stream.close()
+        raise
+    return stream, chunks, None
+
+def _stream_upstream(messages: list, answer: StreamingAnswer, model: str):
+    """
+    Feed the streamed completion into `answer`, yielding partial renders; stops at the 4th sentence.
+    If the first token is slower than the model's HEDGE_PERCENTILE, a second stream is opened
+    and the first to produce a token is used; the other is closed.
+    Token usage (and so cached prompt tokens) arrives in the last chunk. A stream cut at the 4th sentence
+    never gets there, so its tokens are only estimated locally (source="local") and are not in the cached count.
+    """
+    _record_prompt(messages, model)
+    ttft = get_latency("ttft", model)
+    start = time.perf_counter()
+    (stream, chunks, first), hedged = race(
+        lambda: _open_stream(messages, model),
+        ttft.percentile(HEDGE_PERCENTILE),
+        get_hedge_budget(),
+        get_hedge_pool(),
+        discard=lambda opened: opened[0].close(),
+    )
+    _record_hedge(hedged)
+    usage = None
+    try:
+        if first is not None:
+            ttft.add(time.perf_counter() - start)
+            telemetry.observe("ai_upstream_ttft_seconds", time.perf_counter() - start)
+            for chunk in itertools.chain((first,), chunks):
+                if not chunk.choices:
+                    usage = getattr(chunk, "usage", None) or usage
+                    continue
+                if answer.feed(chunk.choices[0].delta.content or ""):
+                    break
+                yield answer.render()
+    finally:
+        stream.close()
+    telemetry.observe("ai_stage_seconds", time.perf_counter() - start, stage="upstream")
+    telemetry.inc("ai_answers_total", source="upstream")
+    if usage is not None:
+        _record_usage(usage)
+    elif telemetry.enabled:
+        # Cut at the 4th sentence, before the usage chunk: count locally
+        telemetry.inc("ai_tokens_total", sum(prompt_tokens(messages, model).values()), kind="prompt", source="local")
+        telemetry.inc("ai_tokens_total", count_tokens(answer.text, model), kind="completion", source="local")
+
+@shared
+def get_router() -> IntentRouter:
+    """BM25 index over the section catalog, built once per process."""
+    return IntentRouter(SECTIONS, SECTION_LINKS, threshold=ROUTER_THRESHOLD)
+
+def ask_ai(question: str, messages: list = None, session: str = "background") -> str:
+    """
+    Answer one question. Navigation questions are answered locally from the catalog.
+    Passing `messages` (multi-turn context) skips the router, fast-model routing, the shared
+    cache and the in-flight registry, since the answer then depends on the conversation.
+    Upstream calls queue for a slot under `session`; if none frees up, returns AI_BUSY.
+    While the circuit breaker is open, returns degraded_answer() without calling upstream.
+    """
+    # With conversation context the question may refer back ("and the second one?"): leave it to the model
+    local = get_router().route(question) if messages is None else None
+    if local is not None:
+        telemetry.inc("ai_answers_total", source="router")
+        return local
+    if messages is not None:
+        try:
+            with upstream_call(session):
+                return _fetch_answer(question, messages)
+        except Exception as e:
+            return _error_reply(e, question)
+    key = _answer_key(question)
+    cached = _recall(question, key)
+    if cached is not None:
+        return cached
+
+    def fetch():
+        with upstream_call(session):
+            return _fetch_answer(question)
+
+    try:
+        answer = get_inflight().do(key, fetch, timeout=WAIT_TIMEOUT)
+    except Exception as e:
+        return _error_reply(e, question)
+    _remember(question, key, answer)
+    return answer
+
+def ask_ai_stream(question: str, messages: list = None, session: str = "background"):
+    """
+    Streaming version of ask_ai. Yields the partial answer (Markdown) as tokens arrive;
+    the last value yielded is the final answer, formatted exactly like ask_ai's.
+    The upstream stream is closed as soon as the 4th sentence ends.
+    If the same question is already being answered, waits for that answer instead.
+    The upstream slot is held until the stream is closed.
+    """
+    # With conversation context the question may refer back ("and the second one?"): leave it to the model
+    local = get_router().route(question) if messages is None else None
+    if local is not None:
+        telemetry.inc("ai_answers_total", source="router")
+        yield local
+        return
+    answer = StreamingAnswer()
+    if messages is not None:
+        try:
+            with upstream_call(session):
+                yield from _stream_upstream(messages, answer, _model_for(question, messages))
+            with telemetry.timer("ai_stage_seconds", stage="postprocess"):
+                final = _nonempty(answer.final())
+        except Exception as e:
+            yield _error_reply(e, question)
+            return
+        yield final
+        return
+    key = _answer_key(question)
+    cached = _recall(question, key)
+    if cached is not None:
+        yield cached
+        return
+    inflight = get_inflight()
+    call, leader = inflight.begin(key)
+    if not leader:
+        try:
+            result = inflight.wait(call, timeout=WAIT_TIMEOUT)
+        except Exception as e:
+            yield _error_reply(e, question)
+            return
+        telemetry.inc("ai_answers_total", source="coalesced")
+        yield result
+        return
+    try:
+        with telemetry.timer("ai_stage_seconds", stage="prompt"):
+            messages = build_messages(question)
+        with upstream_call(session):
+            yield from _stream_upstream(messages, answer, _model_for(question))
+        with telemetry.timer("ai_stage_seconds", stage="postprocess"):
+            final = _nonempty(answer.final())
+    except Exception as e:
+        inflight.finish(key, call, error=e)
+        yield _error_reply(e, question)
+        return
+    except BaseException:
+        # The generator was closed early; don't leave waiters hanging.
+        inflight.finish(key, call, error=RuntimeError("stream abandoned"))
+        raise
+    _remember(question, key, final)
+    inflight.finish(key, call, result=final)
+    yield final
+
+def ask_ai_many(questions: list, session: str = "background") -> list:
+    """
+    Answer several questions at once on the shared AsyncOpenAI client,
+    without holding a thread per request. Uses the same cache, in-flight registry,
+    upstream slots (one per question sent) and circuit breaker as ask_ai.
+    """
+    inflight = get_inflight()
+    answers, led, waiting = {}, [], []
+    for q in questions:
+        key = _answer_key(q)
+        cached = _recall(q, key)
+        if cached is not None:
+            answers[q] = cached
+            continue
+        call, leader = inflight.begin(key)
+        (led if leader else waiting).append((q, key, call))
+
+    async def _gather(batch):
+        return await asyncio.gather(*(_afetch_answer(q) for q, _, _ in batch), return_exceptions=True)
+
+    breaker = get_breaker()
+    with contextlib.ExitStack() as slots:
+        batch = []
+        for q, key, call in led:
+            try:
+                if not breaker.allow():
+                    raise CircuitOpen("upstream circuit is open")
+                try:
+                    slots.enter_context(upstream_slot(session))
+                except Busy:
+                    breaker.record(None, 0.0)
+                    raise
+            except (Busy, CircuitOpen) as e:
+                inflight.finish(key, call, error=e)
+                answers[q] = _error_reply(e, q)
+                continue
+            batch.append((q, key, call))
+        start = time.monotonic()
+        try:
+            results = get_async_runner().run(_gather(batch), timeout=WAIT_TIMEOUT) if batch else []
+        except Exception as e:
+            results = [e] * len(batch)
+    elapsed = time.monotonic() - start
+    for (q, key, call), res in zip(batch, results):
+        breaker.record(not isinstance(res, BaseException), elapsed)
+        if isinstance(res, BaseException):
+            inflight.finish(key, call, error=res)
+            answers[q] = _error_reply(res, q)
+        else:
+            _remember(q, key, res)
+            inflight.finish(key, call, result=res)
+            answers[q] = res
+    for q, key, call in waiting:
+        try:
+            answers[q] = inflight.wait(call, timeout=WAIT_TIMEOUT)
+            telemetry.inc("ai_answers_total", source="coalesced")
+        except Exception as e:
+            answers[q] = _error_reply(e, q)
+    return [answers[q] for q in questions]
+
+@shared
+def warm_answer_cache() -> threading.Thread:
+    """Precompute the preset button answers once per process, in the background."""
+    def _warm():
+        ask_ai_many(list(PRESET_PROMPTS.values()))
+
+    t = threading.Thread(target=_warm, name="warm-answer-cache", daemon=True)
+    t.start()
+    return t
+
+# --------------------------------------------------
+# Speculative prefetch of follow-up questions
+# --------------------------------------------------
+@shared
+def get_prefetch_budget() -> HedgeBudget:
+    """Upstream calls prefetching may spend: PREFETCH_RATIO per question asked, saved up to one round."""
+    return HedgeBudget(ratio=PREFETCH_RATIO, burst=max(1, PREFETCH_K))
+
+@shared
+def get_prefetcher() -> Prefetcher:
+    """Background workers that answer predicted follow-ups into the shared cache, process-wide."""
+    return Prefetcher(
+        _prefetch,
+        _is_cached,
+        get_prefetch_budget(),
+        idle=_upstream_idle,
+        workers=PREFETCH_WORKERS,
+        on_outcome=lambda outcome: telemetry.inc("ai_prefetch_total", outcome=outcome),
+    )
+
+def _prefetch(question: str) -> str:
+    key = _answer_key(question)
+
+    def fetch():
+        with upstream_call("prefetch"):
+            return _fetch_answer(question)
+
+    answer = get_inflight().do(key, fetch, timeout=WAIT_TIMEOUT)
+    _remember(question, key, answer)
+    return answer
+
+def _is_cached(question: str) -> bool:
+    key = _answer_key(question)
+    # count=False: a prefetch probe is not a user lookup, so it must not move the cache hit rate
+    if get_answer_cache().get(key, count=False) is not None:
+        return True
+    pack = get_answer_pack(ANSWER_PACK)
+    return pack is not None and pack.get(key) is not None
+
+def _upstream_idle() -> bool:
+    """Room for speculative calls: breaker closed, nobody queued, at most half the slots in use."""
+    stats = get_admission().stats()
+    return get_breaker().state == CLOSED and not stats["queued"] and stats["inflight"] <= MAX_INFLIGHT // 2
+
+def _claim_prefetch(answer: str) -> None:
+    if PREFETCH_K and get_prefetcher().claim(answer):
+        telemetry.inc("ai_prefetch_total", outcome="hit")
+
+def prefetch_followups(session: str) -> None:
+    """Predict this session's next questions, offer them as suggestions and start answering them."""
+    if not PREFETCH_K:
+        return
+    chat = st.session_state.chat
+    asked = [t.text for t in chat.recent(chat.max_turns) if t.role == "You"]
+    followups = predict(chat.recent(6), SECTIONS, asked, PREFETCH_K)
+    st.session_state.followups = followups
+    get_prefetch_budget().request()
+    get_prefetcher().submit(session, followups)
+
+@shared
+def get_summary_pool() -> ThreadPoolExecutor:
+    """Background workers that fold old turns into each session's rolling summary."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-summary")
+
+def _summarize(prior: str, turns: list) -> str:
+    convo = "\n".join(f"{t.role}: {t.text}" for t in turns)
+    with upstream_call("summary"):
+        r = get_client(api_key).chat.completions.create(
+            model=MODEL,
+            messages=build_summary_messages(prior, convo),
+            temperature=0.2,
+        )
+    _record_usage(r.usage)
+    return r.choices[0].message.content.strip()
+
+def context_messages(question: str):
+    """Multi-turn message list for `question` within CONTEXT_BUDGET tokens, or None if there is no history to send."""
+    if not MULTI_TURN:
+        return None
+    summary = st.session_state.summary
+    # Every turn the summary does not cover yet: those that do not fit the budget are folded into it
+    turns = st.session_state.chat.since(summary.upto_ts)
+    if not summary.text and not turns:
+        return None
+    messages, overflow = build_context(build_messages(question), turns, summary, CONTEXT_BUDGET, MODEL)
+    summary.schedule(overflow, _summarize, get_summary_pool())
+    return messages
+
+def push_chat(q: str):
+    # The answer is generated (and streamed) below the chat history; see the sidebar.
+    st.session_state.pending = q
+
+def render_answer(q: str):
+    with telemetry.timer("ai_stage_seconds", stage="render"):
+        _render_answer(q)
+
+def _render_answer(q: str):
+    st.markdown("**You:**")
+    st.markdown(q)
+    st.markdown("**AI:**")
+    session = st.session_state.session_id
+    if PREFETCH_K:
+        get_prefetcher().cancel(session)  # predictions for the previous question are moot now
+    if not admit_question():
+        msg = AI_SLOW_DOWN
+        st.markdown(msg)
+    elif not STREAM:
+        msg = ask_ai(q, context_messages(q), session)
+        st.markdown(msg)
+    else:
+        box = st.empty()
+        msg = ""
+        for msg in ask_ai_stream(q, context_messages(q), session):
+            box.markdown(msg + " ▌")
+        box.markdown(msg)
+    st.session_state.chat.append("You", q)
+    st.session_state.chat.append("AI", msg)
+    if msg not in (AI_SLOW_DOWN, AI_BUSY, AI_ERROR):
+        prefetch_followups(session)
+
+# --------------------------------------------------
+# Sidebar chat (fragment)
+# --------------------------------------------------
+def assistant_status():
+    state = get_breaker().state
+    if state == OPEN:
+        st.caption("🔴 Limited mode: answering from saved replies while the AI service recovers.")
+    elif state == HALF_OPEN:
+        st.caption("🟡 Reconnecting to the AI service…")
+    else:
+        st.caption("🟢 Online")
+
+@st.fragment
+def ai_chat():
+    """
+    Sidebar chat (presets, history, input). Runs as a fragment: a Send or preset
+    click reruns only this function, not the whole page.
+    """
+    init_session()  # fragment reruns count as activity too
+    assistant_status()
+    st.caption("Example prompts (click to try):")
+
+    c1, c2 = st.columns(2)
+    if c1.button("60-sec tour", use_container_width=True):
+        push_chat(PRESET_PROMPTS["60-sec tour"])
+    if c2.button("Where should I start?", use_container_width=True):
+        push_chat(PRESET_PROMPTS["Where should I start?"])
+
+    if st.button("Explain credit score", use_container_width=True):
+        push_chat(PRESET_PROMPTS["Explain credit score"])
+
+    st.divider()
+
+    chat = st.session_state.chat
+    if len(chat) > st.session_state.chat_shown:
+        if st.button("Load earlier messages", use_container_width=True):
+            st.session_state.chat_shown += CHAT_PAGE
+    for role, msg in chat.recent(st.session_state.chat_shown):
+        st.markdown(f"**{role}:**")
+        st.markdown(msg)
+    live = st.container()
+
+    user_q = st.text_input("Ask a question", placeholder="Type your question here…")
+    if st.button("Send", type="primary", use_container_width=True) and user_q.strip():
+        push_chat(user_q.strip())
+
+    if st.session_state.pending:
+        q, st.session_state.pending = st.session_state.pending, None
+        with live:
+            render_answer(q)
+
+    if st.session_state.followups:
+        st.caption("You might also ask:")
+        for i, q in enumerate(st.session_state.followups):
+            # A callback, so the question is pending before this fragment reruns
+            st.button(q, key=f"followup-{i}", on_click=push_chat, args=(q,), use_container_width=True)
+
+# --------------------------------------------------
+# Entry points used by app.py
+# --------------------------------------------------
+@shared
+def init() -> None:
+    """Process-wide setup, run when app.py first loads this module (see startup.load); later calls do nothing."""
+    telemetry.enabled = METRICS
+    telemetry.collect(_collect_stats)
+    telemetry.set("ai_prompt_info", 1, version=PROMPT_VERSION, prefix=PREFIX_HASH)
+    get_sessions().start(SESSION_SWEEP)
+    if METRICS_PORT:
+        start_metrics_server(int(METRICS_PORT))
+    if api_key:
+        get_client(api_key)
+        warm_answer_cache()
+
+@shared
+def get_sessions() -> SessionRegistry:
+    """Last activity and estimated memory of every session using the assistant, process-wide."""
+    return SessionRegistry(
+        idle_ttl=SESSION_IDLE_TTL,
+        memory_budget=int(SESSION_MEMORY_MB * 2**20),
+        policy=SESSION_EVICT if SHARED_STORE is not None else "evict",
+        sample_every=SESSION_SAMPLE,
+        on_sweep=_record_sessions,
+    )
+
+def _record_sessions(stats: dict) -> None:
+    for state in ("active", "idle", "spilled"):
+        telemetry.set("ai_sessions", stats[state], state=state)
+    telemetry.set("ai_session_bytes", stats["bytes"], where="process")
+    telemetry.set("ai_session_bytes", stats["stored_bytes"], where="backend")
+    for reason, n in stats["released"].items():
+        telemetry.inc("ai_session_evictions_total", n, reason=reason)
+
+def session_report() -> dict:
+    sessions = get_sessions()
+    return {**sessions.stats(), "top": sessions.top()}
+
+def init_session() -> None:
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = (SID_IN_URL and st.query_params.get("sid")) or uuid.uuid4().hex
+        if SID_IN_URL:
+            st.query_params["sid"] = st.session_state.session_id
+    session = get_sessions().touch(st.session_state, st.session_state.session_id)
+    if "chat" not in st.session_state:
+        # Also after the sweep released it: reloads the conversation from the state backend
+        st.session_state.chat = ChatHistory(
+            max_turns=40, spill=True, store=SHARED_STORE, key=st.session_state.session_id, ttl=CHAT_TTL
+        )
+        get_sessions().own(session, st.session_state.chat)
+    if "chat_shown" not in st.session_state:
+        st.session_state.chat_shown = CHAT_PAGE
+    if "pending" not in st.session_state:
+        st.session_state.pending = None
+    if "summary" not in st.session_state:
+        st.session_state.summary = RollingSummary()
+    if "followups" not in st.session_state:
+        st.session_state.followups = []
+
+IMG_CANDIDATES = ["ai_assistant.png", "picture.png", "picture.jpg", "picture.jpeg", "picture.webp"]
+
+def render_sidebar(assets: AssetManager) -> None:
+    """The assistant sidebar: intro card, close button and the chat."""
+    init_session()
+    with st.sidebar:
+        img = assets.first(IMG_CANDIDATES)
+        if img is not None and st.get_option("server.enableStaticServing"):
+            # A link to the static route: the browser fetches (and caches) the image, reruns send no bytes
+            st.markdown(f'<img src="{img.url}" alt="" style="width: 100%">', unsafe_allow_html=True)
+        elif img is not None:
+            st.image(img.read(), use_container_width=True)
+
+        st.markdown(
+            """
+<div class="ai-card">
+  <div class="ai-title">AI Assistant</div>
+  <p class="ai-desc">
+    Hi! I am your <span class="ai-highlight">AI assistant</span>.<br/>
+    Ask questions about this app, explore features, and get simple explanations in plain English.
+  </p>
+  <div class="ai-note">
+    No login • No private data • You decide when to use AI
+  </div>
+</div>
+""",
+            unsafe_allow_html=True,
+        )
+
+        if st.button("Close AI Assistant", use_container_width=True):
+            st.session_state.show_ai = False
+            if PREFETCH_K:
+                get_prefetcher().cancel(st.session_state.session_id)
+            st.rerun()
+
+        st.divider()
+        if not api_key:
+            st.error("Missing OPENAI_API_KEY. Add it in Streamlit Secrets.")
+            return
+        ai_chat()
@@ -0,0 +1,130 @@
+"""
+Circuit breaker for upstream AI calls.
+
+Calls are recorded in a sliding time window. When enough of them fail or run
+slower than `slow_call` seconds, the breaker opens and calls fail immediately
+with CircuitOpen, so the app can serve a degraded answer instead of waiting.
+After `open_for` seconds it lets a few probe calls through (half-open): a
+healthy probe closes it again, a bad one reopens it.
+"""
+import collections
+import contextlib
+import threading
+import time
+from typing import Callable, Optional
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        window: float = 60.0,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call: float = 10.0,
+        slow_rate: float = 0.5,
+        open_for: float = 30.0,
+        probes: int = 1,
+        on_change: Optional[Callable[[str, str], None]] = None,
+    ):
+        """`on_change(old, new)` is called on every state transition."""
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.slow_rate = slow_rate
+        self.open_for = open_for
+        self.probes = probes
+        self.on_change = on_change
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._calls = collections.deque()  # (time, failed, slow)
+        self._failed = 0
+        self._slow = 0
+        self._probing = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now. In half-open state this reserves a probe; record() releases it."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_for:
+                    return False
+                self._set(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probing >= self.probes:
+                    return False
+                self._probing += 1
+            return True
+
+    def record(self, ok: Optional[bool], elapsed: float) -> None:
+        """Outcome of an allowed call; `ok=None` means it was abandoned and only frees its probe."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = max(0, self._probing - 1)
+                if ok is None:
+                    return
+                if ok and elapsed < self.slow_call:
+                    self._reset()
+                    self._set(CLOSED)
+                else:
+                    self._trip()
+                return
+            if ok is None:
+                return
+            now = time.monotonic()
+            failed, slow = not ok, elapsed >= self.slow_call
+            self._calls.append((now, failed, slow))
+            self._failed += failed
+            self._slow += slow
+            while self._calls and self._calls[0][0] < now - self.window:
+                _, f, s = self._calls.popleft()
+                self._failed -= f
+                self._slow -= s
+            n = len(self._calls)
+            if self.state == CLOSED and n >= self.min_calls and (
+                self._failed / n >= self.failure_rate or self._slow / n >= self.slow_rate
+            ):
+                self._trip()
+
+    @contextlib.contextmanager
+    def call(self, allowed: bool = False):
+        """
+        Guard one upstream call; raises CircuitOpen without running it while the breaker is open.
+        `allowed=True` means the caller already got allow() (and so holds any half-open probe).
+        """
+        if not allowed and not self.allow():
+            raise CircuitOpen("upstream circuit is open")
+        start = time.monotonic()
+        ok = None
+        try:
+            yield
+            ok = True
+        except Exception:
+            ok = False
+            raise
+        finally:
+            self.record(ok, time.monotonic() - start)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "calls": len(self._calls), "failed": self._failed, "slow": self._slow}
+
+    def _trip(self) -> None:
+        self._reset()
+        self.opened_at = time.monotonic()
+        self._set(OPEN)
+
+    def _reset(self) -> None:
+        self._calls.clear()
+        self._failed = self._slow = 0
+
+    def _set(self, state: str) -> None:
+        old, self.state = self.state, state
+        if old != state and self.on_change:
+            self.on_change(old, state)
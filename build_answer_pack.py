@@ -0,0 +1,135 @@
+"""
+Build a versioned answer pack from a corpus of frequent questions.
+
+Each question goes through the same prompt and post-processing as ask_ai in
+assistant.py, and the answers are written to a memory-mappable pack (answer_pack.py)
+that the app serves before calling the API.
+
+    # answer directly, at most 8 requests in flight
+    python build_answer_pack.py onboarding_questions.txt -o answer_pack.bin --concurrency 8
+
+    # or via the Batch API: write the job file, submit it, then build from its output
+    python build_answer_pack.py onboarding_questions.txt --batch-file batch.jsonl
+    python build_answer_pack.py onboarding_questions.txt --batch-results output.jsonl -o answer_pack.bin
+
+    # offline, against the local mock endpoint; written to answer_pack.mock.bin unless -o is given,
+    # and stamped as mock so the app never serves it
+    python build_answer_pack.py onboarding_questions.txt --mock
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from ai_client import make_async_client
+from answer_cache import cache_key
+from answer_pack import write_pack
+from postprocess import format_answer
+from prompt import PROMPT_VERSION, build_messages
+
+
+def read_questions(path: str) -> list:
+    """One question per line; blank lines and lines starting with # are ignored. Duplicates are dropped."""
+    seen, out = set(), []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            q = line.strip()
+            if q and not q.startswith("#") and q not in seen:
+                seen.add(q)
+                out.append(q)
+    return out
+
+
+async def answer_all(questions: list, model: str, api_key: str, base_url: str = None, concurrency: int = 8) -> dict:
+    """{question: answer} for every question that could be answered; failures are reported and skipped."""
+    client = make_async_client(api_key)
+    if base_url:
+        client = client.with_options(base_url=base_url)
+    gate = asyncio.Semaphore(concurrency)
+    answers = {}
+
+    async def one(q: str):
+        async with gate:
+            try:
+                r = await client.chat.completions.create(model=model, messages=build_messages(q), temperature=0.6)
+            except Exception as e:
+                print(f"failed: {q!r}: {e}", file=sys.stderr)
+                return
+        answers[q] = format_answer(r.choices[0].message.content.strip())
+
+    await asyncio.gather(*(one(q) for q in questions))
+    return answers
+
+
+def write_batch_file(questions: list, model: str, path: str) -> None:
+    """Batch API job file; custom_id is the question's line number in the corpus."""
+    with open(path, "w", encoding="utf-8") as f:
+        for i, q in enumerate(questions):
+            job = {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": model, "messages": build_messages(q), "temperature": 0.6},
+            }
+            f.write(json.dumps(job) + "\n")
+
+
+def read_batch_results(questions: list, path: str) -> dict:
+    answers = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            body = (row.get("response") or {}).get("body") or {}
+            if row.get("error") or not body.get("choices"):
+                continue
+            q = questions[int(row["custom_id"])]
+            answers[q] = format_answer(body["choices"][0]["message"]["content"].strip())
+    return answers
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("questions", help="text file with one question per line")
+    parser.add_argument("-o", "--out", help="default: answer_pack.bin (answer_pack.mock.bin with --mock)")
+    parser.add_argument("--model", default=os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"))
+    parser.add_argument("--concurrency", type=int, default=8, help="max requests in flight")
+    parser.add_argument("--base-url", default=os.getenv("OPENAI_BASE_URL"))
+    parser.add_argument("--mock", action="store_true", help="answer with a local mock endpoint (offline)")
+    parser.add_argument("--batch-file", help="write a Batch API job file instead of calling the API")
+    parser.add_argument("--batch-results", help="build the pack from a Batch API output file")
+    args = parser.parse_args(argv)
+
+    args.out = args.out or ("answer_pack.mock.bin" if args.mock else "answer_pack.bin")
+    questions = read_questions(args.questions)
+    if args.batch_file:
+        write_batch_file(questions, args.model, args.batch_file)
+        print(f"wrote {len(questions)} jobs to {args.batch_file}")
+        return 0
+
+    if args.batch_results:
+        answers = read_batch_results(questions, args.batch_results)
+    else:
+        api_key, base_url, server = os.getenv("OPENAI_API_KEY"), args.base_url, None
+        if args.mock:
+            import mock_openai
+
+            server = mock_openai.serve(port=0)
+            api_key, base_url = "mock", f"http://127.0.0.1:{server.server_address[1]}/v1"
+        if not api_key:
+            print("OPENAI_API_KEY is not set (use --mock to build offline)", file=sys.stderr)
+            return 2
+        try:
+            answers = asyncio.run(answer_all(questions, args.model, api_key, base_url, args.concurrency))
+        finally:
+            if server:
+                server.shutdown()
+
+    entries = {cache_key(q, args.model, PROMPT_VERSION): a for q, a in answers.items()}
+    write_pack(args.out, entries, {"model": args.model, "prompt_version": PROMPT_VERSION, "mock": args.mock})
+    print(f"wrote {len(entries)}/{len(questions)} answers to {args.out}")
+    return 0 if len(entries) == len(questions) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
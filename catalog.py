@@ -0,0 +1,94 @@
+"""
+Static content for the landing page.
+
+Everything the page shows that does not depend on the session lives here, so it
+can be rendered once per process (static_page.py) and reused by the assistant.
+"""
+
+NAV = ["MyHub", "Credit Cards", "Loans", "Banking", "Pros"]
+
+# (value, label)
+OUTCOMES = [
+    ("$ Saved", "Discover potential annual savings through better credit cards, loans, and spending decisions."),
+    ("+ Credit", "Track and improve your credit score over time with monitoring and guided plans."),
+    ("↓ Risk", "Reduce financial risk with identity monitoring, alerts, and theft protection."),
+    ("Net Worth", "See your full financial picture by tracking assets, debts, and investments in one place."),
+]
+
+# (section_id, kicker, title, features); section_id is the page anchor (#budgeting, ...)
+SECTIONS = [
+    (
+        "budgeting",
+        "BUDGETING & SPENDING",
+        "Make your money\nwork for you",
+        [
+            ("Budgeting Tool", "Create a budget and take control of your spending."),
+            ("Spending Tracker", "Monitor spending habits and identify potential savings."),
+            ("Subscription Manager", "Effortlessly manage subscriptions and cancel what you no longer need."),
+            ("WalletScore", "A simple score to summarize your financial habits (high-level)."),
+        ],
+    ),
+    (
+        "credit",
+        "CREDIT",
+        "Improve your\ncredit & save",
+        [
+            ("Credit Scores & Reports", "Understand your score and how it changes over time."),
+            ("Credit Builder", "Steps and tools to help strengthen credit history."),
+            ("Credit Report Monitoring", "Alerts for important changes and potential issues."),
+            ("Credit Lock", "Reduce the risk of new credit being opened without you."),
+            ("Credit Improvement Plan", "A guided checklist to improve score drivers."),
+            ("Debt Payoff Plan", "A plan to reduce debt with clear milestones."),
+        ],
+    ),
+    (
+        "offers",
+        "OFFERS",
+        "Personalized offers\nfor your credit",
+        [
+            ("Personalized Credit Card Offers", "Find cards that fit goals like cash back or low APR."),
+            ("Pre-qualified Personal Loans", "Explore loan options without heavy searching."),
+            ("Savings Opportunities", "Discover ways to lower interest, fees, or recurring costs."),
+        ],
+    ),
+    (
+        "investments",
+        "INVESTMENTS",
+        "Monitor and track\nyour investments",
+        [
+            ("Investment Monitoring", "Track investment performance and changes over time."),
+            ("News Feed", "A focused feed that highlights what matters."),
+            ("Retirement Planning", "Plan targets based on timeline and lifestyle goals."),
+            ("Net Worth", "Track assets and liabilities over time."),
+        ],
+    ),
+    (
+        "identity",
+        "IDENTITY",
+        "Protect your\nidentity",
+        [
+            ("Dark Web Monitoring", "Get notified if your information appears in common leak sources."),
+            ("Identity Theft Insurance", "Coverage support if identity theft occurs (summary)."),
+            ("Identity Monitoring", "Alerts for suspicious activity involving identity and accounts."),
+        ],
+    ),
+]
+
+# Link text the assistant uses for each section anchor
+SECTION_LINKS = {
+    "budgeting": "Budgeting & Spending",
+    "credit": "Improve your credit & save",
+    "offers": "Offers",
+    "investments": "Investments",
+    "identity": "Identity",
+}
+
+# (icon, label)
+DEALS = [
+    ("💳", "Credit Cards"),
+    ("💰", "Personal Loans"),
+    ("🚗", "Car Insurance"),
+    ("🐷", "Savings Accounts"),
+    ("🏦", "Checking Accounts"),
+    ("📈", "CDs"),
+]
@@ -0,0 +1,124 @@
+"""
+Per-session chat history with bounded memory.
+
+The newest `max_turns` turns are kept as small slotted objects. Older turns are
+either dropped or, with `spill=True`, packed into zlib-compressed batches
+(up to `max_archived` turns) that are only decompressed when the sidebar pages back.
+With a StateStore (state.py) and a key, every turn is also written through to the
+store and the history is reloaded from it, so any worker can pick up a session.
+The stored copy expires `ttl` seconds after the last turn.
+"""
+import json
+import sys
+import time
+import zlib
+from collections import deque
+from typing import Iterator, List, Optional
+
+SPILL_BATCH = 20
+
+
+class Turn:
+    __slots__ = ("role", "text", "ts")
+
+    def __init__(self, role: str, text: str, ts: float = None):
+        self.role = sys.intern(role)  # only "You" / "AI": one shared string per process
+        self.text = text
+        self.ts = time.time() if ts is None else ts
+
+    def __iter__(self) -> Iterator:
+        # Unpacks like the old (role, msg) tuples
+        yield self.role
+        yield self.text
+
+
+class ChatHistory:
+    def __init__(
+        self,
+        max_turns: int = 40,
+        spill: bool = True,
+        max_archived: int = 400,
+        store=None,
+        key: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.max_turns = max_turns
+        self.spill = spill
+        self.max_archived = max_archived
+        self.store = store if key else None
+        self.key = key
+        self.ttl = ttl
+        self._turns = deque()
+        self._archive = deque()  # (n_turns, compressed batch), oldest first
+        self._archived = 0
+        if self.store is not None:
+            for row in self.store.range("chat", key):
+                self._add(Turn(*json.loads(row)))
+
+    def __len__(self) -> int:
+        return self._archived + len(self._turns)
+
+    def append(self, role: str, text: str) -> None:
+        turn = Turn(role, text)
+        self._add(turn)
+        if self.store is not None:
+            row = json.dumps([turn.role, turn.text, turn.ts])
+            self.store.append("chat", self.key, row, cap=self.max_turns + self.max_archived, ttl=self.ttl)
+
+    def _add(self, turn: Turn) -> None:
+        self._turns.append(turn)
+        if len(self._turns) > self.max_turns:
+            batch = [self._turns.popleft() for _ in range(min(SPILL_BATCH, len(self._turns) - 1))]
+            if self.spill:
+                self._spill(batch)
+
+    def recent(self, n: int) -> List[Turn]:
+        """The newest `n` turns, oldest first; reaches into the compressed archive if needed."""
+        out = list(self._turns)[-n:] if n < len(self._turns) else list(self._turns)
+        for _, blob in reversed(self._archive):
+            if len(out) >= n:
+                break
+            older = [Turn(*row) for row in json.loads(zlib.decompress(blob))]
+            out = older[-(n - len(out)):] + out
+        return out
+
+    def since(self, ts: float) -> List[Turn]:
+        """Every turn newer than `ts`, oldest first; decompresses only the archive batches that reach past it."""
+        out = [t for t in self._turns if t.ts > ts]
+        if len(out) < len(self._turns):
+            return out
+        for _, blob in reversed(self._archive):
+            older = [Turn(*row) for row in json.loads(zlib.decompress(blob))]
+            newer = [t for t in older if t.ts > ts]
+            out = newer + out
+            if len(newer) < len(older):
+                break
+        return out
+
+    def clear(self) -> None:
+        self._turns.clear()
+        self._archive.clear()
+        self._archived = 0
+        if self.store is not None:
+            self.store.delete("chat", self.key)
+
+    def release(self) -> None:
+        """Drop the in-memory copy of a store-backed history; a new ChatHistory for the same key reloads it."""
+        if self.store is not None:
+            self._turns = deque()
+            self._archive = deque()
+            self._archived = 0
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this history (the turns and compressed batches, not the shared store)."""
+        size = sys.getsizeof(self) + sys.getsizeof(self._turns) + sys.getsizeof(self._archive)
+        size += sum(sys.getsizeof(t) + sys.getsizeof(t.text) for t in self._turns)
+        return size + sum(sys.getsizeof(blob) for _, blob in self._archive)
+
+    def _spill(self, batch: List[Turn]) -> None:
+        rows = [(t.role, t.text, t.ts) for t in batch]
+        self._archive.append((len(rows), zlib.compress(json.dumps(rows).encode())))
+        self._archived += len(rows)
+        while self._archived > self.max_archived and self._archive:
+            count, _ = self._archive.popleft()
+            self._archived -= count
@@ -0,0 +1,131 @@
+"""
+Multi-turn context for the AI assistant under a hard input-token budget.
+
+Recent turns are included newest-first until the budget is spent; turns that no
+longer fit are folded into a short rolling summary, computed in the background,
+so the prompt stays the same size however long the conversation gets.
+"""
+import functools
+import re
+import threading
+from concurrent.futures import Executor, Future
+from typing import Callable, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to a local estimate
+    tiktoken = None
+
+# Word pieces of up to 4 characters, or single punctuation marks; slightly over-counts BPE tokens
+_PIECES = re.compile(r"\w{1,4}|[^\w\s]")
+# Rough per-message overhead of the chat format
+MESSAGE_OVERHEAD = 4
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # tiktoken could not load its encoding files (e.g. no network); use the estimate
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    enc = _encoding(model)
+    if enc is not None:
+        return len(enc.encode(text))
+    return len(_PIECES.findall(text))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = "gpt-4o-mini") -> str:
+    """Cut `text` down to at most `max_tokens` tokens."""
+    if max_tokens <= 0:
+        return ""
+    enc = _encoding(model)
+    if enc is not None:
+        ids = enc.encode(text)
+        return text if len(ids) <= max_tokens else enc.decode(ids[:max_tokens])
+    pieces = list(_PIECES.finditer(text))
+    return text if len(pieces) <= max_tokens else text[: pieces[max_tokens - 1].end()]
+
+
+def messages_tokens(messages: List[dict], model: str = "gpt-4o-mini") -> int:
+    return sum(count_tokens(m["content"], model) + MESSAGE_OVERHEAD for m in messages)
+
+
+class RollingSummary:
+    """
+    Summary of the turns that fell out of the context window.
+    Turns with a timestamp <= `upto_ts` are covered by `text`.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.upto_ts = 0.0
+        self._pending: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    def schedule(self, turns: list, summarize: Callable[[str, list], str], executor: Executor) -> None:
+        """Fold `turns` into the summary in the background (one job at a time)."""
+        if not turns or (self._pending is not None and not self._pending.done()):
+            return
+        prior, upto = self.text, turns[-1].ts
+
+        def job():
+            text = summarize(prior, turns)
+            with self._lock:
+                if upto > self.upto_ts:
+                    self.text, self.upto_ts = text, upto
+
+        self._pending = executor.submit(job)
+
+
+def build_context(
+    base: List[dict],
+    turns: list,
+    summary: RollingSummary,
+    budget: int,
+    model: str = "gpt-4o-mini",
+) -> tuple:
+    """
+    Insert the summary and as many recent turns as fit into `base`
+    ([system, ..., current user prompt]) without exceeding `budget` tokens.
+    Returns (messages, overflow): the turns that did not fit and are not yet summarized.
+    """
+    system, current = base[:-1], base[-1]
+    used = messages_tokens(base, model)
+    if used > budget:
+        # The question alone is over budget: trim it rather than break the hard limit
+        over = used - budget
+        keep = count_tokens(current["content"], model) - over
+        current = {**current, "content": truncate_tokens(current["content"], keep, model)}
+        return system + [current], []
+
+    turns = [t for t in turns if t.ts > summary.upto_ts]
+    head = []
+    limit = (budget - used) // 4  # the summary gets at most a quarter of what is left
+    if summary.text and limit > 0:
+        note = {
+            "role": "system",
+            "content": "Summary of the earlier conversation: " + truncate_tokens(summary.text, limit, model),
+        }
+        cost = messages_tokens([note], model)
+        if used + cost <= budget:
+            used += cost
+            head = [note]
+
+    kept = []
+    for i in range(len(turns) - 1, -1, -1):
+        t = turns[i]
+        msg = {"role": "user" if t.role == "You" else "assistant", "content": t.text}
+        cost = count_tokens(t.text, model) + MESSAGE_OVERHEAD
+        if used + cost > budget:
+            return system + head + kept + [current], turns[: i + 1]
+        kept.insert(0, msg)
+        used += cost
+    return system + head + kept + [current], []
@@ -0,0 +1,128 @@
+"""
+Hedged requests: when a call runs longer than most recent calls did, start a
+duplicate and take whichever finishes first.
+
+LatencyTracker supplies the delay (a percentile of recent latencies) and
+HedgeBudget caps the extra load: every request earns `ratio` of a hedge and
+a hedge spends a whole one, so hedges stay under `ratio` of requests.
+race() hedges blocking calls on an executor; arace() hedges coroutines and
+cancels the loser.
+"""
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    def __init__(self, size: int = 512, default: float = 2.0, min_samples: int = 20):
+        """Ring buffer of the last `size` latencies; percentile() returns `default` until `min_samples` are in."""
+        self.default = default
+        self.min_samples = min_samples
+        self._samples = np.zeros(size)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples[self._count % len(self._samples)] = seconds
+            self._count += 1
+
+    def percentile(self, p: float) -> float:
+        with self._lock:
+            n = min(self._count, len(self._samples))
+            if n < self.min_samples:
+                return self.default
+            return float(np.percentile(self._samples[:n], p))
+
+
+class HedgeBudget:
+    def __init__(self, ratio: float = 0.05, burst: float = 3.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.credit = 0.0
+        self.requests = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.credit = min(self.burst, self.credit + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.credit < 1.0:
+                return False
+            self.credit -= 1.0
+            self.hedges += 1
+            return True
+
+
+def race(
+    attempt: Callable[[], T],
+    delay: float,
+    budget: HedgeBudget,
+    executor: Executor,
+    discard: Optional[Callable[[T], None]] = None,
+) -> Tuple[T, Optional[bool]]:
+    """
+    Run `attempt()`, hedging it after `delay` seconds if the budget allows.
+    Returns (first successful result, None if no hedge fired / whether the hedge won).
+    A losing attempt is cancelled if it has not started; otherwise `discard` gets
+    its result when it finishes (e.g. to close a stream).
+    """
+    if budget.ratio <= 0:
+        return attempt(), None
+    budget.request()
+    primary = executor.submit(attempt)
+    done, _ = wait([primary], timeout=delay)
+    if done or not budget.try_spend():
+        return primary.result(), None
+    hedge = executor.submit(attempt)
+    pending, error, winner = {primary, hedge}, None, None
+    while pending and winner is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for f in done:
+            if f.exception() is not None:
+                error = error or f.exception()
+            elif winner is None:
+                winner = f
+            elif discard:
+                discard(f.result())
+    if winner is None:
+        raise error
+    for f in pending:
+        if not f.cancel() and discard:
+            f.add_done_callback(lambda f: f.exception() is None and discard(f.result()))
+    return winner.result(), winner is hedge
+
+
+async def arace(attempt: Callable[[], Awaitable[T]], delay: float, budget: HedgeBudget) -> Tuple[T, Optional[bool]]:
+    """Coroutine version of race(); the losing attempt is cancelled."""
+    if budget.ratio <= 0:
+        return await attempt(), None
+    budget.request()
+    primary = asyncio.ensure_future(attempt())
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done or not budget.try_spend():
+            return await primary, None
+        hedge = asyncio.ensure_future(attempt())
+        tasks.append(hedge)
+        pending, error = set(tasks), None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    return t.result(), t is hedge
+                error = error or t.exception()
+        raise error
+    finally:
+        for t in tasks:
+            t.cancel()
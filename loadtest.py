@@ -0,0 +1,218 @@
+"""
+Offline load test for app.py.
+
+Starts the mock OpenAI endpoint (mock_openai.py), then drives N concurrent
+simulated sessions through streamlit.testing.v1.AppTest: each opens the
+assistant and plays a mix of preset-button clicks and free-text Sends.
+Reports throughput, latency percentiles and memory per session, and exits
+non-zero when a --max-* / --min-* gate fails or an action went missing,
+so it can run in CI.
+
+    python loadtest.py --sessions 20 --turns 5 --latency lognormal:0.8,0.5 --rate-limit-rate 0.02 --max-p99 6
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+APP = Path(__file__).with_name("app.py")
+PRESETS = ["60-sec tour", "Where should I start?", "Explain credit score"]
+AI_ERROR_PREFIX = "Sorry — I ran into a temporary issue"
+BUSY_PREFIXES = ("I'm handling a lot of questions", "You're asking faster than")
+DEGRADED_PREFIX = "The assistant is in limited mode"
+
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def _button(at, label: str):
+    return next(b for b in at.sidebar.button if b.label == label)
+
+
+def share_test_runtime() -> None:
+    """
+    AppTest installs a mock Runtime for each script run and clears it when the
+    run ends, which breaks other sessions' runs still in flight in this process.
+    Fall back to one shared mock Runtime instead.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+
+
+def run_session(seed: int, args, questions: list, samples: list, sessions: list, lock: threading.Lock) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(str(APP), default_timeout=args.timeout)
+    at.secrets["OPENAI_API_KEY"] = "mock"
+    try:
+        at.run()
+        next(b for b in at.button if b.label == "Ask AI Assistant").click().run()
+    except Exception as e:
+        # The assistant never opened: every planned action of this session is lost
+        with lock:
+            samples.extend(("setup", 0.0, type(e).__name__) for _ in range(args.turns))
+        return
+    for turn in range(args.turns):
+        if rng.random() < args.preset_share:
+            kind, label, q = "preset", rng.choice(PRESETS), None
+        else:
+            kind, label, q = "free_text", "Send", rng.choice(questions)
+            if rng.random() < args.unique_share:
+                q = f"{q} (session {seed}, turn {turn})"  # defeats the caches, like real long-tail traffic
+        start = time.perf_counter()
+        error = None
+        try:
+            if q is not None:
+                at.sidebar.text_input[0].input(q)
+            _button(at, label).click().run()
+            if at.exception:
+                error = "exception"
+            elif any(m.value.startswith(AI_ERROR_PREFIX) for m in at.sidebar.markdown[-2:]):
+                error = "ai_error"
+            elif any(m.value.startswith(BUSY_PREFIXES) for m in at.sidebar.markdown[-2:]):
+                error = "busy"
+            elif any(m.value.startswith(DEGRADED_PREFIX) for m in at.sidebar.markdown[-2:]):
+                error = "degraded"
+        except (StopIteration, IndexError):  # the button or text box is gone, e.g. after an exception
+            error = "missing_control"
+        except Exception as e:  # e.g. the script run timed out
+            error = type(e).__name__
+        with lock:
+            samples.append((kind, time.perf_counter() - start, error))
+        if args.think_time:
+            time.sleep(rng.uniform(0, args.think_time))
+    with lock:
+        sessions.append(at)  # keep the session alive so its memory is still counted
+
+
+def run(args) -> dict:
+    import mock_openai
+
+    config = mock_openai.MockConfig(args.latency, args.token_delay, args.error_rate, args.rate_limit_rate, seed=args.seed)
+    server = mock_openai.serve(port=0, config=config)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["OPENAI_API_KEY"] = "mock"
+    os.environ.setdefault("AI_SESSION_SAMPLE", "0")  # estimate session memory on every run, for the report
+    os.chdir(APP.parent)
+    sys.path.insert(0, str(APP.parent))  # `streamlit run` does this for the app's own modules
+
+    from build_answer_pack import read_questions
+
+    questions = read_questions(args.questions)
+    share_test_runtime()
+    samples, sessions, lock = [], [], threading.Lock()
+    if args.trace_memory:
+        tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    traced_before = tracemalloc.get_traced_memory()[0] if args.trace_memory else 0
+
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=run_session, args=(args.seed + i, args, questions, samples, sessions, lock))
+        for i in range(args.sessions)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    server.shutdown()
+
+    latencies = [s[1] for s in samples]
+    report = {
+        "sessions": args.sessions,
+        "expected_actions": args.sessions * args.turns,
+        "actions": len(samples),
+        "wall_seconds": round(wall, 3),
+        "throughput_per_s": round(len(samples) / wall, 3) if wall else 0.0,
+        "error_rate": round(sum(1 for s in samples if s[2] not in (None, "busy", "degraded")) / len(samples), 4) if samples else 0.0,
+        # answered with the admission controller's fast "busy" reply
+        "busy_rate": round(sum(1 for s in samples if s[2] == "busy") / len(samples), 4) if samples else 0.0,
+        # answered locally while the circuit breaker was open
+        "degraded_rate": round(sum(1 for s in samples if s[2] == "degraded") / len(samples), 4) if samples else 0.0,
+        "latency_s": {
+            kind: {f"p{p}": round(percentile([s[1] for s in samples if kind in ("all", s[0])], p), 4) for p in (50, 95, 99)}
+            for kind in ("all", "preset", "free_text")
+        },
+        # ru_maxrss is KiB on Linux
+        "rss_per_session_kb": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / max(1, len(sessions)), 1),
+    }
+    if args.trace_memory:
+        traced = tracemalloc.get_traced_memory()[0] - traced_before
+        report["traced_per_session_kb"] = round(traced / 1024 / max(1, len(sessions)), 1)
+        tracemalloc.stop()
+    if "assistant" in sys.modules:
+        # the app's own estimate of what the sessions hold (see sessions.py)
+        report["estimated_per_session_kb"] = round(sys.modules["assistant"].session_report()["bytes"] / 1024 / max(1, len(sessions)), 1)
+    report["max_latency_s"] = round(max(latencies), 4) if latencies else 0.0
+    return report
+
+
+def check_gates(report: dict, args) -> list:
+    failures = []
+    if report["actions"] < report["expected_actions"]:
+        failures.append(f"only {report['actions']} of {report['expected_actions']} actions completed")
+    if args.max_p99 is not None and report["latency_s"]["all"]["p99"] > args.max_p99:
+        failures.append(f"p99 {report['latency_s']['all']['p99']}s > {args.max_p99}s")
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        failures.append(f"error rate {report['error_rate']} > {args.max_error_rate}")
+    if args.min_throughput is not None and report["throughput_per_s"] < args.min_throughput:
+        failures.append(f"throughput {report['throughput_per_s']}/s < {args.min_throughput}/s")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions")
+    parser.add_argument("--turns", type=int, default=5, help="chat actions per session")
+    parser.add_argument("--preset-share", type=float, default=0.6, help="share of actions that are preset clicks")
+    parser.add_argument("--unique-share", type=float, default=0.3, help="share of free-text questions made unique")
+    parser.add_argument("--think-time", type=float, default=0.0, help="max seconds a user waits between actions")
+    parser.add_argument("--questions", default=str(APP.with_name("onboarding_questions.txt")))
+    parser.add_argument("--latency", default="lognormal:0.5,0.4", help="mock upstream latency (see mock_openai.py)")
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per script run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--trace-memory", action="store_true", help="also measure per-session memory with tracemalloc (slow)")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--max-p99", type=float, help="fail if overall p99 latency exceeds this (seconds)")
+    parser.add_argument("--max-error-rate", type=float, help="fail if the share of failed actions exceeds this")
+    parser.add_argument("--min-throughput", type=float, help="fail if actions/second is below this")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    failures = check_gates(report, args)
+    for f in failures:
+        print(f"GATE FAILED: {f}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Process-wide metrics for the AI hot path.
+
+Counters, gauges and histograms with labels, exported in Prometheus text format
+(render(), or serve() for a /metrics endpoint) and optionally forwarded to a
+pluggable sink. While disabled every call returns immediately, so the
+instrumentation can stay in place at near-zero cost.
+"""
+import bisect
+import contextlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+# Seconds; covers cache hits (sub-ms) through slow upstream calls
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+HELP = {
+    "ai_stage_seconds": "Time spent per stage of answering (prompt, upstream, postprocess, render).",
+    "ai_upstream_ttft_seconds": "Time to the first streamed token from the API.",
+    "ai_tokens_total": "Prompt, cached prompt and completion tokens (source=api: reported usage, local: estimated).",
+    "ai_prompt_tokens_total": "Locally counted prompt tokens by part (prefix, context, question).",
+    "ai_prompt_info": "Prompt version and hash of the static system prefix in use.",
+    "ai_answers_total": "Answers by where they came from (router, cache, pack, semantic, coalesced, upstream, error).",
+    "ai_errors_total": "Failed AI calls by exception class.",
+    "ai_admission_total": "Admission decisions (admitted, rate_limited, queue_full, timeout).",
+    "ai_queue_seconds": "Time spent queued for an upstream slot.",
+    "ai_breaker_state": "Upstream circuit breaker state (0 closed, 1 half-open, 2 open).",
+    "ai_breaker_transitions_total": "Circuit breaker state changes by new state.",
+    "ai_hedges_total": "Hedged duplicate requests by whether the hedge or the original answered first.",
+    "ai_model_requests_total": "Upstream requests by routed model.",
+    "ai_startup_seconds": "Time to load the AI subsystem (import, init), once per process.",
+    "ai_sessions": "Browser sessions by lifecycle state (active, idle, spilled).",
+    "ai_session_bytes": "Estimated bytes of session state, in this process or left in the state backend by spills.",
+    "ai_session_evictions_total": "Session state released by the sweep, by reason (idle, memory).",
+    "ai_cache_entries": "Entries in the answer caches (answers, semantic).",
+    "ai_cache_lookups": "Answer cache lookups since start, by cache and result (hit, miss).",
+    "ai_breaker_window_calls": "Upstream calls in the circuit breaker's current window, by result (total, failed, slow).",
+    "ai_admission_slots": "Upstream slots: calls in flight and callers queued.",
+    "ai_prefetch_total": "Speculative follow-up prefetches by outcome (fetched, hit, cached, busy, budget, cancelled, stale, dropped, error).",
+}
+
+_NOOP = contextlib.nullcontext()
+
+
+class Registry:
+    def __init__(self, enabled: bool = False, sink: Optional[Callable[[str, str, dict, float], None]] = None):
+        """`sink(kind, name, labels, value)` is called for every counter increment, gauge update and observation."""
+        self.enabled = enabled
+        self.sink = sink
+        self._counters = {}  # (name, labels) -> value
+        self._gauges = {}  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts..., +Inf count], sum
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        if self.sink:
+            self.sink("counter", name, labels, value)
+
+    def set(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+        if self.sink:
+            self.sink("gauge", name, labels, value)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * (len(BUCKETS) + 1), 0.0]
+            hist[0][bisect.bisect_left(BUCKETS, value)] += 1
+            hist[1] += value
+        if self.sink:
+            self.sink("histogram", name, labels, value)
+
+    def timer(self, name: str, **labels):
+        """Context manager observing the elapsed seconds into histogram `name`."""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self, name, labels)
+
+    def collect(self, collector: Callable[[], None]) -> None:
+        """
+        Call `collector()` before every render(), to refresh gauges from components that keep their own counts.
+        Registering the same collector again does nothing.
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        for collector in self._collectors:
+            collector()
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {k: ([*v[0]], v[1]) for k, v in self._histograms.items()}
+        lines, typed = [], set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                if name in HELP:
+                    lines.append(f"# HELP {name} {HELP[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), value in sorted(gauges.items()):
+            header(name, "gauge")
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), (counts, total) in sorted(histograms.items()):
+            header(name, "histogram")
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "start")
+
+    def __init__(self, registry: Registry, name: str, labels: dict):
+        self.registry, self.name, self.labels = registry, name, labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + body + "}"
+
+
+def serve(registry: Registry, port: int, host: str = "0.0.0.0", views: dict = None) -> ThreadingHTTPServer:
+    """
+    Expose `registry` at http://host:port/metrics on a daemon thread.
+    `views` maps further paths to functions returning JSON-serializable admin data, e.g. {"/sessions": ...}.
+    """
+    views = views or {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/metrics":
+                data, content_type = registry.render().encode(), "text/plain; version=0.0.4"
+            elif path in views:
+                data, content_type = json.dumps(views[path](), indent=2).encode(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+# The registry the app and its modules record into; app.py enables it from config
+registry = Registry()
@@ -0,0 +1,211 @@
+"""
+Local mock of the OpenAI chat-completions endpoint, for offline runs and load tests.
+
+    python mock_openai.py --port 8808 --latency lognormal:0.8,0.5 --error-rate 0.01 --rate-limit-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8808/v1 ...
+
+Answers are canned (they echo the question), in both the regular and the
+streaming (server-sent events) response format. Response latency is drawn
+from a configurable distribution; errors (500) and rate limits (429) can be
+injected at a given rate.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Shortest first message reported as cached (providers only cache prefixes this long; see prompt.py)
+CACHE_MIN_TOKENS = 1024
+
+
+class MockConfig:
+    def __init__(
+        self,
+        latency: str = "fixed:0",
+        token_delay: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: int = None,
+    ):
+        """
+        `latency` is the delay before the first byte, as "fixed:S", "uniform:LO,HI",
+        "lognormal:MEDIAN,SIGMA" or "pareto:SCALE,ALPHA" (seconds).
+        `token_delay` is the pause between streamed chunks.
+        """
+        self.latency = latency
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._prefixes = set()  # first messages seen so far, for simulated prompt caching
+        kind, _, params = latency.partition(":")
+        self._kind = kind
+        self._params = [float(p) for p in params.split(",") if p]
+
+    def sample_latency(self) -> float:
+        with self._lock:
+            rng, p = self._rng, self._params
+            if self._kind == "fixed":
+                return p[0] if p else 0.0
+            if self._kind == "uniform":
+                return rng.uniform(p[0], p[1])
+            if self._kind == "lognormal":
+                return p[0] * rng.lognormvariate(0.0, p[1])
+            if self._kind == "pareto":
+                return p[0] * rng.paretovariate(p[1])
+        raise ValueError(f"unknown latency distribution: {self.latency}")
+
+    def sample_fault(self):
+        """None, 429 or 500 for the next request."""
+        with self._lock:
+            r = self._rng.random()
+        if r < self.rate_limit_rate:
+            return 429
+        if r < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+    def usage(self, messages: list, answer: str) -> dict:
+        """
+        Word-count usage. Like a provider prefix cache, a first message seen before is reported as cached,
+        if it is at least CACHE_MIN_TOKENS long.
+        """
+        sizes = [len(m.get("content", "").split()) for m in messages]
+        first = messages[0].get("content", "") if messages else ""
+        with self._lock:
+            cached = sizes[0] if first in self._prefixes and sizes[0] >= CACHE_MIN_TOKENS else 0
+            self._prefixes.add(first)
+        completion = len(answer.split())
+        return {
+            "prompt_tokens": sum(sizes),
+            "completion_tokens": completion,
+            "total_tokens": sum(sizes) + completion,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+
+
+def canned_answer(question: str) -> str:
+    return (
+        f"You asked: {question.strip()[:80]} "
+        "A good first stop is [Budgeting & Spending](#budgeting) to see where your money goes. "
+        "When you are ready, [Improve your credit & save](#credit) explains what moves your score. "
+        "Would you like a quick tour of [Offers](#offers) too?"
+    )
+
+
+def _question(body: dict) -> str:
+    """The user's question: the last message."""
+    return body.get("messages", [{}])[-1].get("content", "")
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = MockConfig()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        time.sleep(self.config.sample_latency())
+        fault = self.config.sample_fault()
+        if fault == 429:
+            error = {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}
+            self._send_json(429, {"error": error}, {"Retry-After": "1"})
+            return
+        if fault == 500:
+            self._send_json(500, {"error": {"message": "Internal error (mock)", "type": "server_error"}})
+            return
+        answer = canned_answer(_question(body))
+        if body.get("stream"):
+            self._stream(body, answer)
+        else:
+            self._send_json(200, self._completion(body, answer))
+
+    def _completion(self, body: dict, answer: str) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+            "usage": self.config.usage(body.get("messages", []), answer),
+        }
+
+    def _stream(self, body: dict, answer: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        try:
+            for word in answer.split(" "):
+                chunk = {
+                    "id": cid,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "mock"),
+                    "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                if self.config.token_delay:
+                    time.sleep(self.config.token_delay)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                chunk = {
+                    "id": cid,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "mock"),
+                    "choices": [],
+                    "usage": self.config.usage(body.get("messages", []), answer),
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client stopped reading (e.g. after the 4th sentence)
+        self.close_connection = True
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8808, config: MockConfig = None) -> ThreadingHTTPServer:
+    """Start the mock server on a daemon thread and return it (call .shutdown() to stop)."""
+    handler = type("ConfiguredMockHandler", (MockHandler,), {"config": config or MockConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-openai", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA | pareto:SCALE,ALPHA")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    args = parser.parse_args()
+    config = MockConfig(args.latency, args.token_delay, args.error_rate, args.rate_limit_rate)
+    server = serve(args.host, args.port, config)
+    print(f"Mock OpenAI endpoint on http://{args.host}:{args.port}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
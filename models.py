@@ -0,0 +1,29 @@
+"""
+Model routing: short, simple questions go to a faster, cheaper model; long or
+complex ones (comparisons, "why", planning, several questions at once) go to
+the configured model.
+"""
+import re
+from typing import Optional
+
+from context import count_tokens
+
+_WORD = re.compile(r"[a-z]+")
+
+COMPLEX_CUES = frozenset({
+    "compare", "comparison", "versus", "vs", "difference", "differences", "why",
+    "explain", "calculate", "plan", "planning", "strategy", "pros", "cons", "tradeoff", "tradeoffs",
+})
+
+
+def is_simple(question: str, max_tokens: int = 16) -> bool:
+    if question.count("?") > 1 or count_tokens(question) > max_tokens:
+        return False
+    return not COMPLEX_CUES.intersection(_WORD.findall(question.lower()))
+
+
+def pick_model(question: str, default: str, fast: Optional[str] = None, max_tokens: int = 16) -> str:
+    """`fast` for simple questions when it is configured, else `default`."""
+    if fast and is_simple(question, max_tokens):
+        return fast
+    return default
@@ -0,0 +1,127 @@
+"""
+Post-processing for AI answers: cap to 4 sentences, then split into short
+paragraphs with section bullets (Budgeting/Credit/Offers/Investments/Identity)
+on their own lines.
+
+format_answer(raw) == natural_segment(cap_to_4_sentences(raw)), computed in
+one linear pass with precompiled patterns.
+"""
+import re
+
+MAX_SENTENCES = 4
+MAX_CHARS = 420  # hard cap for a single run-on "sentence"
+
+# A sentence ends at . ! or ? followed by whitespace (one space once whitespace is collapsed)
+_BOUNDARY = re.compile(r"[.!?] ")
+_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_BULLET = re.compile(r"\s-\s+(Budgeting|Credit|Offers|Investments|Identity)\s*:", re.I)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _collapse(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _cap(t: str, max_sentences: int = MAX_SENTENCES) -> str:
+    """Cap already-collapsed text; stops scanning at the last sentence kept."""
+    n = 0
+    for m in _BOUNDARY.finditer(t):
+        n += 1
+        if n == max_sentences:
+            return t[: m.start() + 1]
+    if n == 0 and len(t) > MAX_CHARS:
+        return t[:MAX_CHARS].rsplit(" ", 1)[0] + "…"
+    return t
+
+
+def _segment(s: str) -> str:
+    """Segment already-collapsed text: bullets stand alone, other sentences go two per paragraph."""
+    s = _BULLET.sub(r"\n\n- \1:", s)
+    blocks, current = [], ""
+    for sent in _SPLIT.split(s):
+        sent = sent.strip()
+        if not sent:
+            continue
+        if sent.startswith("- "):
+            if current:
+                blocks.append(current)
+                current = ""
+            blocks.append(sent)
+        elif current:
+            # Every sentence but the last ends in [.!?], so this closes a two-sentence paragraph.
+            blocks.append(current + " " + sent)
+            current = ""
+        else:
+            current = sent
+    if current:
+        blocks.append(current)
+    out = "\n\n".join(blocks)
+    if "\n\n\n" in out:
+        out = _BLANK_LINES.sub("\n\n", out)
+    return out.strip()
+
+
+def cap_to_4_sentences(text: str) -> str:
+    if not text:
+        return text
+    return _cap(_collapse(text))
+
+
+def natural_segment(text: str) -> str:
+    if not text:
+        return text
+    return _segment(_collapse(text))
+
+
+def format_answer(text: str) -> str:
+    """Cap + segment a raw model answer."""
+    if not text:
+        return text
+    return _segment(_cap(_collapse(text)))
+
+
+class StreamingAnswer:
+    """
+    Incremental counterpart of format_answer.
+    Feed it streamed deltas; it stops accepting text once the 4th sentence ends,
+    and the capped text formats exactly like the full (non-streamed) answer.
+    A run-on answer with no sentence end is cut once it passes MAX_CHARS, since
+    final() would throw the rest away anyway.
+    """
+
+    def __init__(self, max_sentences: int = MAX_SENTENCES):
+        self.max_sentences = max_sentences
+        self.text = ""
+        self.sentences = 0
+        self.done = False
+        self._scanned = 0
+        self._chars = 0  # length of the text once whitespace is collapsed, as format_answer measures it
+        self._space = False  # whitespace seen since the last counted character
+
+    def feed(self, delta: str) -> bool:
+        if self.done or not delta:
+            return self.done
+        self.text += delta
+        # Only scan new characters; a sentence ends at [.!?] followed by whitespace.
+        for i in range(self._scanned, len(self.text)):
+            if not self.text[i].isspace():
+                self._chars += 1 + (self._space and self._chars > 0)
+                self._space = False
+                continue
+            self._space = True
+            if i and self.text[i - 1] in ".!?":
+                self.sentences += 1
+                if self.sentences >= self.max_sentences:
+                    self.text = self.text[:i]
+                    self.done = True
+                    break
+        self._scanned = len(self.text)
+        if not self.sentences and self._chars > MAX_CHARS:
+            self.done = True
+        return self.done
+
+    def render(self) -> str:
+        return natural_segment(self.text)
+
+    def final(self) -> str:
+        return format_answer(self.text.strip())
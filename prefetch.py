@@ -0,0 +1,157 @@
+"""
+Speculative prefetch of likely follow-up questions.
+
+After an answer, the next question is predictable from what the conversation
+is about: an answer that links to [Improve your credit & save](#credit) is
+usually followed by a question about one of the credit features. predict()
+ranks the catalog features of the sections the recent turns point to, and the
+Prefetcher answers the top few in the background, so the answer cache already
+holds them when the user asks (or clicks the suggestion).
+
+Prefetching is strictly lower priority than real traffic. It uses a small
+worker pool and drops a job instead of waiting when upstream is busy. It
+spends from a cost budget that is refilled by real questions. Jobs that no
+longer matter (superseded by a newer question, the user closed the assistant,
+or they waited too long) are cancelled before they reach the API.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+_ANCHOR = re.compile(r"\]\(#([\w-]+)\)")
+_WORD = re.compile(r"[a-z0-9]+")
+# How a feature is asked about; not phrased as navigation, so the router leaves it to the LLM
+QUESTION = "Tell me more about {}"
+
+
+def predict(turns: list, sections: list, asked=(), k: int = 3) -> List[str]:
+    """
+    The `k` most likely next questions after `turns` (oldest first, as (role, text)),
+    from the features of catalog.SECTIONS. A section scores for every link to it in an
+    answer, newer turns counting more; a feature scores extra for every word its
+    name shares with the user's last question. Questions in `asked` are skipped.
+    """
+    weights = defaultdict(float)
+    last_question = ""
+    for age, (role, text) in enumerate(reversed(turns)):
+        if role == "You":
+            last_question = last_question or text
+        else:
+            for section_id in _ANCHOR.findall(text):
+                weights[section_id] += 1.0 / (age + 1)
+    words = set(_WORD.findall(last_question.lower()))
+    asked = {q.strip().lower() for q in asked}
+    ranked = []
+    for section_id, _, _, features in sections:
+        if section_id not in weights:
+            continue
+        for order, (name, _) in enumerate(features):
+            question = QUESTION.format(name)
+            if question.lower() in asked:
+                continue
+            score = weights[section_id] + 0.5 * len(words & set(_WORD.findall(name.lower())))
+            ranked.append((-score, -weights[section_id], order, question))
+    return [r[-1] for r in sorted(ranked)[:k]]
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        fetch: Callable[[str], str],
+        cached: Callable[[str], bool],
+        budget,
+        idle: Callable[[], bool] = lambda: True,
+        workers: int = 2,
+        max_pending: int = 32,
+        max_wait: float = 30.0,
+        on_outcome: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        `fetch(q)` answers and caches `q`; `cached(q)` says whether that is already done.
+        `budget` (a hedge.HedgeBudget) pays for each fetch; `idle()` says whether upstream has room to spare.
+        Jobs not started within `max_wait` seconds are dropped. `on_outcome(outcome)` sees every
+        job's outcome: fetched, cached, busy, budget, cancelled, stale, dropped or error.
+        """
+        self.fetch = fetch
+        self.cached = cached
+        self.budget = budget
+        self.idle = idle
+        self.max_pending = max_pending
+        self.max_wait = max_wait
+        self.on_outcome = on_outcome
+        self.outcomes = defaultdict(int)
+        self.hits = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai-prefetch")
+        self._pending = {}  # session -> [Future]
+        self._answers = OrderedDict()  # prefetched answer -> question, until it is served once
+        self._lock = threading.Lock()
+
+    def submit(self, session: str, questions: List[str]) -> None:
+        """Prefetch `questions` for `session`, replacing whatever was still queued for it."""
+        self.cancel(session)
+        with self._lock:
+            # Forget sessions whose jobs have all finished
+            self._pending = {s: fs for s, fs in self._pending.items() if not all(f.done() for f in fs)}
+            room = self.max_pending - sum(1 for fs in self._pending.values() for f in fs if not f.done())
+            jobs = [self._pool.submit(self._run, q, time.monotonic()) for q in questions[:max(0, room)]]
+            if jobs:
+                self._pending[session] = jobs
+        for _ in questions[len(jobs):]:
+            self._outcome("dropped")
+
+    def cancel(self, session: str) -> None:
+        """Drop the jobs queued for `session` (already running ones finish, their answers stay cached)."""
+        with self._lock:
+            jobs = self._pending.pop(session, [])
+        for job in jobs:
+            if job.cancel():
+                self._outcome("cancelled")
+
+    def claim(self, answer: str) -> bool:
+        """Whether `answer` was prefetched and this is its first use (a prefetch hit)."""
+        with self._lock:
+            if self._answers.pop(answer, None) is None:
+                return False
+            self.hits += 1
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            fetched = self.outcomes.get("fetched", 0)
+            pending = sum(1 for fs in self._pending.values() for f in fs if not f.done())
+            return {
+                "pending": pending,
+                "outcomes": dict(self.outcomes),
+                "hits": self.hits,
+                "hit_rate": round(self.hits / fetched, 4) if fetched else 0.0,
+            }
+
+    def _run(self, question: str, queued_at: float) -> None:
+        if time.monotonic() - queued_at > self.max_wait:
+            self._outcome("stale")
+        elif self.cached(question):
+            self._outcome("cached")
+        elif not self.idle():
+            self._outcome("busy")
+        elif not self.budget.try_spend():
+            self._outcome("budget")
+        else:
+            try:
+                answer = self.fetch(question)
+            except Exception:
+                self._outcome("error")
+                return
+            with self._lock:
+                self._answers[answer] = question
+                while len(self._answers) > 1024:
+                    self._answers.popitem(last=False)
+            self._outcome("fetched")
+
+    def _outcome(self, outcome: str) -> None:
+        with self._lock:
+            self.outcomes[outcome] += 1
+        if self.on_outcome is not None:
+            self.on_outcome(outcome)
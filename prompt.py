@@ -0,0 +1,106 @@
+"""
+The assistant's prompt, shared by the app and the offline answer-pack builder.
+
+Everything that does not depend on the request lives in SYSTEM_PREFIX, a
+constant that is sent byte-for-byte the same as the first message of every
+call; the per-request part is just the question (plus any conversation
+context, which build_context() inserts after the prefix). Providers cache
+identical prompt prefixes, but only from CACHE_MIN_TOKENS tokens up. Today's
+prefix is about 356 tokens, so no request is served from the provider's cache
+yet: the stable layout only pays off once the instructions grow past the
+minimum. `python prompt.py` reports where the prefix stands.
+
+    python prompt.py "How do I improve my credit?"    # local token counts per part
+"""
+import functools
+import hashlib
+import sys
+
+from context import MESSAGE_OVERHEAD, count_tokens
+
+# Bump whenever the prompt below changes, so cached and prebuilt answers are not reused
+PROMPT_VERSION = "v2"
+
+# Never interpolate anything into this: a single changed byte moves every request off the cached prefix
+SYSTEM_PREFIX = """\
+You are a friendly AI onboarding assistant for a finance app UI.
+
+Your role:
+- Help users understand what this app offers
+- Explain financial concepts in plain, simple English
+- Gently guide users without giving rigid steps
+- Never claim access to personal or private data
+
+Important rules:
+- The answer MUST be no more than 4 sentences total.
+- Keep it short and helpful (no long explanations).
+- If you mention an app area, include a clickable Markdown link to it:
+  Budgeting -> [Budgeting & Spending](#budgeting)
+  Credit -> [Improve your credit & save](#credit)
+  Offers -> [Offers](#offers)
+  Investments -> [Investments](#investments)
+  Identity -> [Identity](#identity)
+- Do NOT use labeled sections (no "Overview:", etc).
+- If the question is vague, ask ONE short clarifying question (still within 4 sentences).
+
+Context:
+This app includes budgeting, credit education, offers comparison, investments tracking, and identity protection.
+It is for learning and navigation only (no login, no private data).
+
+The user's message is their question. Respond naturally like a helpful product guide, in Markdown.
+"""
+
+SUMMARY_PREFIX = """\
+You summarize conversations between a user and a finance app onboarding assistant.
+Write an updated summary in at most 3 sentences. Keep the topics and app areas the user asked about.
+"""
+
+# Shortest prompt prefix the provider caches (OpenAI: 1024 tokens)
+CACHE_MIN_TOKENS = 1024
+
+# Identifies the exact prefix bytes; reported with the version so a silent edit is visible in metrics and logs
+PREFIX_HASH = hashlib.blake2b(SYSTEM_PREFIX.encode(), digest_size=6).hexdigest()
+
+
+def build_messages(question: str) -> list:
+    return [
+        {"role": "system", "content": SYSTEM_PREFIX},
+        {"role": "user", "content": question.strip()},
+    ]
+
+
+def build_summary_messages(prior: str, convo: str) -> list:
+    return [
+        {"role": "system", "content": SUMMARY_PREFIX},
+        {"role": "user", "content": f"Earlier summary:\n{prior or '(none)'}\n\nNew turns:\n{convo}"},
+    ]
+
+
+def prompt_tokens(messages: list, model: str = "gpt-4o-mini") -> dict:
+    """
+    Local token counts per part of `messages`: the static prefix, the conversation
+    context between it and the question, and the question itself.
+    """
+    parts = {"prefix": 0, "context": 0, "question": 0}
+    for i, m in enumerate(messages):
+        if i == 0 and m["content"] in (SYSTEM_PREFIX, SUMMARY_PREFIX):
+            parts["prefix"] += _prefix_tokens(m["content"], model) + MESSAGE_OVERHEAD
+        else:
+            parts["question" if i == len(messages) - 1 else "context"] += count_tokens(m["content"], model) + MESSAGE_OVERHEAD
+    return parts
+
+
+@functools.lru_cache(maxsize=16)
+def _prefix_tokens(text: str, model: str) -> int:
+    # The prefixes never change: count them once per model, not on every request
+    return count_tokens(text, model)
+
+
+if __name__ == "__main__":
+    question = " ".join(sys.argv[1:]) or "What can this app do?"
+    print(f"prompt {PROMPT_VERSION} prefix {PREFIX_HASH}")
+    parts = prompt_tokens(build_messages(question))
+    for part, n in parts.items():
+        print(f"{part:>9}: {n} tokens")
+    if parts["prefix"] < CACHE_MIN_TOKENS:
+        print(f"prefix is below the provider's {CACHE_MIN_TOKENS}-token caching minimum: nothing is cached")
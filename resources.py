@@ -0,0 +1,36 @@
+"""
+Process-wide shared resources.
+
+@shared builds a resource once per process per distinct arguments, like
+st.cache_resource, but it can be called from any thread. st.cache_resource
+needs a ScriptRunContext, which the assistant's own threads do not have: the
+async event loop, the hedge pool, the cache warmer and the prefetch workers.
+Called from those threads, it logs a "missing ScriptRunContext" warning on
+every call.
+"""
+import functools
+import threading
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def shared(fn: Callable[..., T]) -> Callable[..., T]:
+    """Memoize `fn` by its (hashable) arguments for the life of the process; thread-safe."""
+    cache = {}
+    lock = threading.RLock()
+
+    @functools.wraps(fn)
+    def get(*args, **kwargs) -> T:
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        with lock:
+            if key not in cache:
+                cache[key] = fn(*args, **kwargs)
+            return cache[key]
+
+    get.clear = cache.clear
+    return get
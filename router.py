@@ -0,0 +1,110 @@
+"""
+Local intent router for navigation questions.
+
+"Where do I track subscriptions?" or "What is Credit Lock?" are answered from the
+section catalog (BM25 over feature names/descriptions) with a templated answer and
+the right anchor link. Only questions that ask where something is, or name a
+feature in full, are routed: "What is a good credit score?" is a question about
+the concept, not the feature, and goes to the LLM like anything else.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Optional
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Words that mark a question as "where is it" rather than "teach me"
+NAV_CUES = {"where", "find", "locate", "section", "page"}
+# Words that only count as navigation when the question names a feature in full ("What is Credit Lock?")
+NAME_CUES = {"what", "whats", "which", "show", "open"}
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "i", "do", "can", "my", "me", "to", "of", "in", "on", "for", "and",
+    "it", "this", "that", "app", "with", "does", "should", "how", "you", "your", "about",
+} | NAV_CUES | NAME_CUES
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def _terms(text: str) -> list:
+    return [_stem(w) for w in _WORD.findall(text.lower().replace("'", "")) if w not in _STOPWORDS]
+
+
+class IntentRouter:
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, sections: list, links: dict, threshold: float = 0.5):
+        """`sections` is catalog.SECTIONS; `threshold` is the share of query terms the best feature must cover."""
+        self.threshold = threshold
+        self.links = links
+        self.docs = []  # (section_id, name, desc)
+        self._index = defaultdict(list)  # term -> [(doc, tf)]
+        self._name_terms = []
+        lengths = []
+        for section_id, kicker, _, features in sections:
+            for name, desc in features:
+                doc = len(self.docs)
+                self.docs.append((section_id, name, desc))
+                name_terms = _terms(name)
+                self._name_terms.append(set(name_terms))
+                # Feature names count double: they are what users ask for by name
+                terms = name_terms * 2 + _terms(desc) + _terms(kicker)
+                lengths.append(len(terms))
+                for term, tf in Counter(terms).items():
+                    self._index[term].append((doc, tf))
+        self._lengths = lengths
+        self._avg_len = sum(lengths) / len(lengths) if lengths else 1.0
+        n = len(self.docs)
+        self._idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self._index.items()}
+
+    def search(self, question: str) -> tuple:
+        """(best doc index or None, BM25 score, share of query terms the best doc matches)."""
+        terms = set(_terms(question))
+        if not terms:
+            return None, 0.0, 0.0
+        scores, matched = defaultdict(float), defaultdict(int)
+        for term in terms:
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc, tf in self._index[term]:
+                norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[doc] / self._avg_len)
+                scores[doc] += idf * tf * (self.k1 + 1) / norm
+                matched[doc] += 1
+        if not scores:
+            return None, 0.0, 0.0
+        best = max(scores, key=scores.get)
+        return best, scores[best], matched[best] / len(terms)
+
+    def route(self, question: str) -> Optional[str]:
+        """A local Markdown answer for navigation questions, or None to fall back to the LLM."""
+        words = set(_WORD.findall(question.lower().replace("'", "")))
+        terms = set(_terms(question))
+        if words & NAV_CUES:
+            best, _, coverage = self.search(question)
+            if best is None or coverage < self.threshold or not self._name_terms[best] & terms:
+                return None
+            return self._answer(best)
+        if words & NAME_CUES and terms:
+            # The most specific feature whose whole name is in the question
+            named = [d for d, name in enumerate(self._name_terms) if name and name <= terms]
+            best = max(named, key=lambda d: len(self._name_terms[d]), default=None)
+            if best is None or len(self._name_terms[best]) / len(terms) < self.threshold:
+                return None
+            return self._answer(best)
+        return None
+
+    def suggest(self, question: str) -> Optional[str]:
+        """The closest feature for any question (no navigation cue or coverage needed), or None if nothing matches."""
+        best, _, _ = self.search(question)
+        return None if best is None else self._answer(best)
+
+    def _answer(self, doc: int) -> str:
+        section_id, name, desc = self.docs[doc]
+        label = self.links.get(section_id, section_id.title())
+        return f"**{name}**: {desc} You can find it in [{label}](#{section_id})."
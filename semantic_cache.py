@@ -0,0 +1,236 @@
+"""
+Semantic (near-duplicate) answer cache.
+
+Questions are embedded offline with a signed hashing vectorizer over character
+n-grams and words, and stored as rows of one contiguous float32 matrix. Lookups
+use random-projection LSH buckets to pick candidate rows, then exact cosine
+similarity on those rows, so they stay sub-millisecond at 100k entries.
+Entries expire `ttl` seconds after they were stored. At capacity the
+least-recently-used tenth is evicted and its rows are reused in place; the LSH
+buckets keep pointing at reused rows until a background rebuild drops the stale
+references, so neither eviction nor the rebuild blocks a request.
+"""
+import re
+import threading
+import time
+import zlib
+from itertools import chain
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9']+")
+# Common paraphrases mapped to one word before embedding
+SYNONYMS = {
+    "begin": "start", "beginning": "start", "started": "start", "starting": "start", "first": "start",
+    "whats": "what", "explain": "what", "describe": "what", "meaning": "what",
+    "scores": "score", "rating": "score", "cards": "card", "loans": "loan",
+    "app": "site", "website": "site", "platform": "site", "page": "site",
+    "quick": "short", "brief": "short", "overview": "tour", "walkthrough": "tour",
+}
+
+
+class HashingEmbedder:
+    """Unit-length float32 vectors from hashed char 3-grams and words; no model, no network."""
+
+    def __init__(self, dim: int = 128, memo: int = 200_000):
+        self.dim = dim
+        self._memo = {}  # feature -> (column, sign); hashing is most of the cost of embedding
+        self._memo_size = memo
+
+    def _features(self, text: str) -> list:
+        words = [SYNONYMS.get(w, w) for w in _WORD.findall(text.lower().replace("'", ""))]
+        padded = " " + " ".join(words) + " "
+        grams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        return grams + ["w:" + w for w in words]
+
+    def _hashed(self, feat: str) -> Tuple[int, float]:
+        hit = self._memo.get(feat)
+        if hit is None:
+            h = zlib.crc32(feat.encode())
+            hit = (h % self.dim, 1.0 if h & 0x80000000 else -1.0)
+            if len(self._memo) < self._memo_size:
+                self._memo[feat] = hit
+        return hit
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vec = out[row]
+            for feat in self._features(text):
+                col, sign = self._hashed(feat)
+                vec[col] += sign
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        threshold: float = 0.9,
+        ttl: Optional[float] = None,
+        dim: int = 128,
+        tables: int = 12,
+        bits: int = 14,
+        seed: int = 7,
+    ):
+        """`ttl` is how long an entry is served after it was stored, in seconds (None: until evicted)."""
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self.embedder = HashingEmbedder(dim)
+        self.hits = 0
+        self.misses = 0
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((dim, tables * bits)).astype(np.float32)
+        self._tables, self._bits = tables, bits
+        self._weights = (1 << np.arange(bits)).astype(np.int64)
+        self._vecs = np.zeros((capacity, dim), dtype=np.float32)
+        self._row_codes = np.zeros((capacity, tables), dtype=np.int64)
+        self._stored_at = np.zeros(capacity, dtype=np.float64)
+        self._last_used = np.zeros(capacity, dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._questions: List[Optional[str]] = [None] * capacity
+        self._answers: List[Optional[str]] = [None] * capacity
+        self._buckets = [dict() for _ in range(tables)]  # code -> [row, ...], may name dead or reused rows
+        self._n = 0  # rows ever used
+        self._free: List[int] = []  # evicted rows, reused before the matrix grows
+        self._stale = 0  # bucket references left behind by reused rows
+        self._rebuilding: Optional[List[int]] = None  # rows added while a rebuild runs
+        self._lock = threading.Lock()
+        self._rebuilt = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        return self._n - len(self._free)
+
+    def _codes(self, vecs: np.ndarray) -> np.ndarray:
+        """LSH code of each vector in each table, shape (len(vecs), tables)."""
+        bits = (vecs @ self._planes) > 0
+        return bits.reshape(len(vecs), self._tables, self._bits).astype(np.int64) @ self._weights
+
+    def lookup(self, question: str, threshold: Optional[float] = None) -> Optional[str]:
+        return self.lookup_many([question], threshold)[0]
+
+    def lookup_many(self, questions: List[str], threshold: Optional[float] = None) -> List[Optional[str]]:
+        """Batched top-1 lookup: the cached answer of the most similar question above `threshold`, or None."""
+        return [None if e is None else e[1] for e in self.lookup_entries(questions, threshold)]
+
+    def lookup_entries(
+        self, questions: List[str], threshold: Optional[float] = None
+    ) -> List[Optional[Tuple[str, str, float]]]:
+        """
+        Like lookup_many, but each hit is (cached question, answer, stored_at), so callers can say which
+        question the answer was for and keep the entry's expiry.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        q = self.embedder.embed(questions)
+        codes = self._codes(q).tolist()
+        now = time.time()
+        results = [None] * len(questions)
+        with self._lock:
+            buckets = self._buckets
+            # Rows found in several tables repeat; scoring a repeat is cheaper than deduplicating
+            rows = np.fromiter(
+                chain.from_iterable(b.get(c, ()) for row_codes in codes for b, c in zip(buckets, row_codes)),
+                dtype=np.int64,
+            )
+            if len(rows):
+                live = self._alive[rows]
+                if self.ttl is not None:
+                    live &= self._stored_at[rows] >= now - self.ttl
+                rows = rows[live]
+                if len(rows):
+                    sims = self._vecs[rows] @ q.T  # (candidates, questions)
+                    best = sims.argmax(axis=0)
+                    for j, i in enumerate(best):
+                        if sims[i, j] >= threshold:
+                            row = int(rows[i])
+                            self._last_used[row] = now
+                            results[j] = (self._questions[row], self._answers[row], float(self._stored_at[row]))
+            found = sum(r is not None for r in results)
+            self.hits += found
+            self.misses += len(results) - found
+        return results
+
+    def add(self, question: str, answer: str, stored_at: Optional[float] = None) -> None:
+        vec = self.embedder.embed([question])
+        code = self._codes(vec)[0]
+        stored_at = time.time() if stored_at is None else stored_at
+        rebuild = False
+        with self._lock:
+            if not self._free and self._n == self.capacity:
+                self._evict(max(1, self.capacity // 10))
+            if self._free:
+                row = self._free.pop()
+                self._stale += self._tables
+            else:
+                row = self._n
+                self._n += 1
+            self._vecs[row] = vec[0]
+            self._row_codes[row] = code
+            self._alive[row] = True
+            self._stored_at[row] = stored_at
+            self._last_used[row] = stored_at
+            self._questions[row] = question
+            self._answers[row] = answer
+            for table, c in enumerate(code.tolist()):
+                self._buckets[table].setdefault(c, []).append(row)
+            if self._rebuilding is not None:
+                self._rebuilding.append(row)
+            elif self._stale > self._n * self._tables // 2:
+                self._rebuilding = []
+                rebuild = True
+        if rebuild:
+            threading.Thread(target=self._rebuild, name="semantic-cache-rebuild", daemon=True).start()
+
+    def compact(self) -> None:
+        """Drop the stale bucket references now (normally done in the background)."""
+        with self._lock:
+            while self._rebuilding is not None:
+                self._rebuilt.wait()
+            self._rebuilding = []
+        self._rebuild()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _evict(self, count: int) -> None:
+        """Free the `count` least recently used live rows; expired rows go first."""
+        used = np.where(self._alive[: self._n], self._last_used[: self._n], np.inf)
+        if self.ttl is not None:
+            used[self._stored_at[: self._n] < time.time() - self.ttl] = -np.inf
+        victims = np.argpartition(used, count - 1)[:count]
+        victims = victims[self._alive[victims]]
+        self._alive[victims] = False
+        for row in victims.tolist():
+            self._questions[row] = self._answers[row] = None
+        self._free.extend(victims.tolist())
+
+    def _rebuild(self) -> None:
+        """Rebuild the LSH buckets from the live rows, off the lock; rows added meanwhile are carried over."""
+        with self._lock:
+            n = self._n
+            rows = np.flatnonzero(self._alive[:n])
+            codes = self._row_codes[rows]
+        buckets = []
+        for table in range(self._tables):
+            order = np.argsort(codes[:, table], kind="stable")
+            keys, starts = np.unique(codes[order, table], return_index=True)
+            groups = np.split(rows[order], starts[1:])
+            buckets.append({k: g.tolist() for k, g in zip(keys.tolist(), groups)} if len(rows) else {})
+        with self._lock:
+            for row in self._rebuilding:
+                for table, c in enumerate(self._row_codes[row].tolist()):
+                    buckets[table].setdefault(c, []).append(row)
+            self._buckets = buckets
+            self._stale = len(self._rebuilding) * self._tables
+            self._rebuilding = None
+            self._rebuilt.notify_all()
@@ -0,0 +1,227 @@
+"""
+Session lifecycle: last activity and approximate memory per browser session.
+
+Streamlit keeps a session's state for as long as its websocket stays open, so
+abandoned tabs hold their chat until the node runs out of memory. Every script
+run touches the session here; a background sweep then releases the state of
+sessions that have been idle for `idle_ttl` seconds, and of the longest-idle
+sessions whenever the estimated total goes over `memory_budget` bytes.
+
+What is released are the objects registered with own() (the chat history):
+with policy "spill" they drop their in-memory copy and are reloaded from the
+state backend on the next visit; with "evict" they are cleared for good.
+Spilling only frees memory when the backend lives outside the process
+(SQLite, Redis), so callers pick "evict" for memory://. What spilled sessions
+left in the backend is reported separately ("stored_bytes"), not as reclaimed.
+
+Memory is estimated from object sizes (sys.getsizeof, walked through
+containers), sampled at most every `sample_every` seconds per session; that is
+cheap enough for every run, unlike tracemalloc, and close enough to rank sessions.
+"""
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Callable, Optional
+
+# Stop walking an object graph after this many objects; the estimate is for ranking, not accounting
+MAX_OBJECTS = 20000
+# A session with a run this recently (seconds) counts as active, and is never released to meet the memory budget
+ACTIVE_FOR = 60.0
+# Types that are shared process-wide or hold no per-session data
+_OPAQUE = (type, type(sys), type(len), type(lambda: 0), weakref.ref)
+
+
+def estimate_size(obj) -> int:
+    """
+    Approximate bytes reachable from `obj`. Objects with an nbytes() method
+    report their own size (so shared resources they point to are not counted).
+    """
+    seen, size, todo = set(), 0, [obj]
+    while todo and len(seen) < MAX_OBJECTS:
+        o = todo.pop()
+        if id(o) in seen or isinstance(o, _OPAQUE):
+            continue
+        seen.add(id(o))
+        nbytes = getattr(o, "nbytes", None)
+        if callable(nbytes):
+            size += nbytes()
+            continue
+        size += sys.getsizeof(o, 0)
+        if isinstance(o, dict):
+            todo.extend(o.keys())
+            todo.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            todo.extend(o)
+        elif not isinstance(o, (str, bytes, bytearray, int, float, bool, memoryview)):
+            if hasattr(o, "__dict__"):
+                todo.append(vars(o))
+            for name in getattr(type(o), "__slots__", ()):
+                if hasattr(o, name):
+                    todo.append(getattr(o, name))
+    return size
+
+
+class Session:
+    __slots__ = ("sid", "last_seen", "nbytes", "stored", "measured_at", "spilled", "owned", "_lock", "__weakref__")
+
+    def __init__(self, sid: str):
+        self.sid = sid
+        self.last_seen = time.monotonic()
+        self.nbytes = 0
+        self.stored = 0  # estimated bytes the state backend still holds for a spilled session
+        self.measured_at = 0.0
+        self.spilled = None  # why the state was released ("idle" or "memory"), until the next run
+        self.owned = []  # objects with release() / clear(), released on eviction
+        self._lock = threading.Lock()
+
+
+class SessionRegistry:
+    # The session-state key holding each session's Session
+    KEY = "_session"
+
+    def __init__(
+        self,
+        idle_ttl: float = 900.0,
+        memory_budget: int = 0,
+        policy: str = "spill",
+        sample_every: float = 30.0,
+        on_sweep: Optional[Callable[[dict], None]] = None,
+    ):
+        """
+        `memory_budget` is the estimated bytes all sessions may hold (0: no limit);
+        `policy` is "spill" or "evict"; `on_sweep(stats)` is called after every sweep, with
+        stats() plus "released": the sessions released by that sweep, per reason.
+        """
+        if policy not in ("spill", "evict"):
+            raise ValueError(f"unknown session eviction policy: {policy}")
+        self.idle_ttl = idle_ttl
+        self.memory_budget = memory_budget
+        self.policy = policy
+        self.sample_every = sample_every
+        self.on_sweep = on_sweep
+        self.evictions = {"idle": 0, "memory": 0}
+        # Entries disappear with their session state, when Streamlit closes the session
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def touch(self, state, sid: str) -> Session:
+        """
+        Record activity for the session whose state is `state` (st.session_state), from its script thread.
+        If the sweep released the session's state meanwhile, the owned keys are removed so they are recreated.
+        """
+        session = state.get(self.KEY)
+        if session is None:
+            session = state[self.KEY] = Session(sid)
+            with self._lock:
+                self._sessions.add(session)
+        now = time.monotonic()
+        with session._lock:
+            session.last_seen = now
+            spilled, session.spilled = session.spilled, None
+        if spilled:
+            session.stored = 0
+            session.measured_at = 0.0  # reloaded: measure it again
+            for key in [k for k, v in state.items() if any(v is o for o in session.owned)]:
+                del state[key]
+            session.owned.clear()
+        if now - session.measured_at >= self.sample_every:
+            session.measured_at = now
+            session.nbytes = sum(estimate_size(v) for k, v in state.items() if k != self.KEY)
+        return session
+
+    def own(self, session: Session, obj) -> None:
+        """Release `obj` (it has release() and clear()) when the session is evicted."""
+        session.owned.append(obj)
+
+    def sweep(self) -> dict:
+        """Release idle sessions, then the longest-idle ones while over the memory budget."""
+        now = time.monotonic()
+        before = dict(self.evictions)
+        with self._lock:
+            sessions = sorted(self._sessions, key=lambda s: s.last_seen)
+        live = [s for s in sessions if not s.spilled and s.owned]
+        for s in live:
+            if now - s.last_seen >= self.idle_ttl:
+                self._release(s, "idle", now - self.idle_ttl)
+        if self.memory_budget:
+            total = sum(s.nbytes for s in live if not s.spilled)
+            for s in live:
+                if total <= self.memory_budget:
+                    break
+                if not s.spilled and now - s.last_seen >= ACTIVE_FOR:
+                    nbytes = s.nbytes
+                    if self._release(s, "memory", now - ACTIVE_FOR):
+                        total -= nbytes
+        stats = self.stats(sessions)
+        stats["released"] = {reason: n - before[reason] for reason, n in self.evictions.items()}
+        if self.on_sweep is not None:
+            self.on_sweep(stats)
+        return stats
+
+    def _release(self, session: Session, reason: str, idle_since: float) -> bool:
+        with session._lock:
+            if session.last_seen > idle_since:  # touched since we looked
+                return False
+            session.spilled = reason
+        for obj in session.owned:
+            if self.policy == "evict":
+                obj.clear()
+            else:
+                obj.release()
+        session.stored = session.nbytes if self.policy == "spill" else 0
+        session.nbytes = 0
+        self.evictions[reason] += 1
+        return True
+
+    def stats(self, sessions: list = None) -> dict:
+        if sessions is None:
+            with self._lock:
+                sessions = list(self._sessions)
+        now = time.monotonic()
+        spilled = sum(1 for s in sessions if s.spilled)
+        idle = sum(1 for s in sessions if not s.spilled and now - s.last_seen >= ACTIVE_FOR)
+        return {
+            "sessions": len(sessions),
+            "active": len(sessions) - spilled - idle,
+            "idle": idle,
+            "spilled": spilled,
+            "bytes": sum(s.nbytes for s in sessions),
+            "stored_bytes": sum(s.stored for s in sessions),
+            "evictions": dict(self.evictions),
+        }
+
+    def top(self, n: int = 10) -> list:
+        """The `n` sessions holding the most memory; session ids are shortened, since they unlock a conversation."""
+        with self._lock:
+            sessions = list(self._sessions)
+        now = time.monotonic()
+        return [
+            {
+                "sid": s.sid[:8],
+                "bytes": s.nbytes,
+                "stored_bytes": s.stored,
+                "idle_seconds": round(now - s.last_seen, 1),
+                "spilled": s.spilled,
+            }
+            for s in sorted(sessions, key=lambda s: s.nbytes, reverse=True)[:n]
+        ]
+
+    def start(self, interval: float) -> threading.Thread:
+        """Sweep every `interval` seconds on a daemon thread; later calls return the thread already running."""
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception:
+                    pass  # a failed sweep must not stop the next one
+
+        with self._lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(target=run, name="session-sweep", daemon=True)
+                self._sweeper.start()
+            return self._sweeper
@@ -0,0 +1,27 @@
+"""
+App settings: Streamlit secrets first, then environment variables.
+
+Reading st.secrets raises FileNotFoundError when there is no secrets.toml at
+all; here that just means "not set", so a deploy configured only through the
+environment (or not configured yet) still renders the page.
+"""
+import os
+
+import streamlit as st
+
+
+def get(name: str, default=None):
+    try:
+        value = st.secrets.get(name)
+    except FileNotFoundError:
+        value = None
+    return value if value is not None else os.getenv(name, default)
+
+
+def flag(name: str, default: bool = False) -> bool:
+    value = str(get(name, "")).strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    return default
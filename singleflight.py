@@ -0,0 +1,59 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight call: the first
+caller (the leader) does the work, everyone else waits for its result. If the
+leader fails, every waiter gets the same exception.
+"""
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key: str) -> Tuple[_Call, bool]:
+        """Return the in-flight call for `key` and whether the caller is its leader."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def finish(self, key: str, call: _Call, result: Any = None, error: Optional[BaseException] = None) -> None:
+        """Publish the leader's outcome and release every waiter."""
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result, call.error = result, error
+        call.done.set()
+
+    def wait(self, call: _Call, timeout: Optional[float] = None) -> Any:
+        """Block until the leader finishes; raises its error, or TimeoutError after `timeout` seconds."""
+        if not call.done.wait(timeout):
+            raise TimeoutError("timed out waiting for an identical in-flight request")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        call, leader = self.begin(key)
+        if not leader:
+            return self.wait(call, timeout)
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result=result)
+        return result
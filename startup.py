@@ -0,0 +1,91 @@
+"""
+Startup timing for lazily loaded subsystems.
+
+load() imports a module while recording every module imported along the way,
+with its self and cumulative import time (the same breakdown as
+`python -X importtime`), then runs the module's init(). It does so once per
+process: later calls, from any thread or script rerun, get the same result.
+"""
+import builtins
+import importlib.util
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+_loaded = {}  # module name -> (module, stages)
+_lock = threading.Lock()
+
+
+class ImportTimer:
+    """Records (depth, self µs, cumulative µs, module) for new imports made by the current thread."""
+
+    def __init__(self):
+        self.rows = []
+        self._stack = []  # time spent in child imports, per open import
+        self._thread = threading.get_ident()
+        self._original = None
+
+    def __enter__(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if threading.get_ident() != self._thread:
+            return self._original(name, globals, locals, fromlist, level)
+        full = name
+        if level:
+            try:
+                full = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                pass
+        if full in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.rows.append((len(self._stack), (elapsed - children) * 1e6, elapsed * 1e6, full))
+
+    def report(self) -> str:
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for depth, own, cumulative, name in self.rows:
+            lines.append(f"import time: {own:9.0f} | {cumulative:10.0f} | {'  ' * depth}{name}")
+        return "\n".join(lines)
+
+
+def load(name: str, report: bool = False, on_load: Optional[Callable[[object, dict], None]] = None):
+    """
+    Import module `name` and run its init(), once per process. Returns (module, {stage: seconds}).
+    On the first load only, `report` prints the breakdown to stderr and `on_load(module, stages)` is called.
+    Concurrent callers wait for that first load.
+    """
+    with _lock:
+        if name not in _loaded:
+            _loaded[name] = _load(name, report)
+            if on_load is not None:
+                on_load(*_loaded[name])
+        return _loaded[name]
+
+
+def _load(name: str, report: bool):
+    timer = ImportTimer()
+    start = time.perf_counter()
+    with timer:
+        module = __import__(name)
+    imported = time.perf_counter()
+    module.init()
+    stages = {"import": imported - start, "init": time.perf_counter() - imported}
+    if report:
+        print(timer.report(), file=sys.stderr)
+        print(f"startup {name}: " + ", ".join(f"{k} {v * 1000:.1f} ms" for k, v in stages.items()), file=sys.stderr)
+    return module, stages
@@ -0,0 +1,392 @@
+"""
+Pluggable state backend for chat history, the answer cache and rate-limit counters.
+
+With a shared backend every worker process can serve every session, and a
+restart does not lose conversations. open_backend() takes a URL:
+
+    memory://                   in-process only (the default)
+    sqlite:///path/to/state.db  a SQLite file in WAL mode, shared by the processes on one host
+    redis://host:6379/0         any Redis-protocol server (needs the `redis` package)
+
+StateStore sits in front of a backend: reads go through a small local cache,
+writes are queued and applied in batches (one transaction or pipeline) by a
+background thread. Rate limits are the exception; take() is synchronous and
+atomic, so they hold across workers. Keys and lists can expire; the same thread
+purges expired ones from memory and SQLite (Redis expires them itself).
+"""
+import atexit
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import List, Optional
+
+try:
+    import redis
+except ImportError:  # optional: only needed for redis:// URLs
+    redis = None
+
+# Queued write operations:
+#   ("set", ns, key, value, expires_at or None)
+#   ("delete", ns, key)
+#   ("append", ns, key, value, cap or None, expires_at or None)
+
+
+class MemoryBackend:
+    shared = False  # only this process sees it
+
+    def __init__(self):
+        self._kv = {}  # (ns, key) -> (value, expires_at)
+        self._lists = defaultdict(list)
+        self._list_expires = {}  # (ns, key) -> expires_at
+        self._lock = threading.Lock()
+
+    def get(self, ns: str, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._kv.get((ns, key))
+        if item is None or (item[1] is not None and item[1] < time.time()):
+            return None
+        return item[0]
+
+    def range(self, ns: str, key: str, start: int = 0) -> List[str]:
+        with self._lock:
+            expires = self._list_expires.get((ns, key))
+            if expires is not None and expires < time.time():
+                return []
+            return list(self._lists.get((ns, key), ()))[start:]
+
+    def take(self, ns: str, key: str, rate: float, burst: float, cost: float) -> bool:
+        now, full = time.time(), burst / rate
+        with self._lock:
+            tokens, expires = self._kv.get((ns, key), (burst, now))
+            tokens = min(burst, float(tokens) + max(0.0, full - (expires - now)) * rate)
+            if tokens < cost:
+                return False
+            self._kv[(ns, key)] = (tokens - cost, now + full)
+            return True
+
+    def apply(self, ops: list) -> None:
+        with self._lock:
+            for op in ops:
+                if op[0] == "set":
+                    self._kv[(op[1], op[2])] = (op[3], op[4])
+                elif op[0] == "delete":
+                    self._kv.pop((op[1], op[2]), None)
+                    self._lists.pop((op[1], op[2]), None)
+                    self._list_expires.pop((op[1], op[2]), None)
+                else:
+                    items = self._lists[(op[1], op[2])]
+                    items.append(op[3])
+                    if op[4] and len(items) > op[4]:
+                        del items[:-op[4]]
+                    if op[5]:
+                        self._list_expires[(op[1], op[2])] = op[5]
+
+    def purge(self) -> int:
+        """Drop expired keys and lists; returns how many went."""
+        now = time.time()
+        with self._lock:
+            keys = [k for k, (_, expires) in self._kv.items() if expires is not None and expires < now]
+            for k in keys:
+                del self._kv[k]
+            lists = [k for k, expires in self._list_expires.items() if expires < now]
+            for k in lists:
+                del self._list_expires[k]
+                self._lists.pop(k, None)
+        return len(keys) + len(lists)
+
+
+class SQLiteBackend:
+    shared = True
+
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS kv (
+                ns TEXT, key TEXT, value, expires REAL, PRIMARY KEY (ns, key)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS lists (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, ns TEXT, key TEXT, value TEXT
+            );
+            CREATE INDEX IF NOT EXISTS lists_key ON lists (ns, key, id);
+            CREATE TABLE IF NOT EXISTS list_expires (
+                ns TEXT, key TEXT, expires REAL, PRIMARY KEY (ns, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS kv_expires ON kv (expires) WHERE expires IS NOT NULL;
+            """
+        )
+
+    def get(self, ns: str, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM kv WHERE ns = ? AND key = ? AND (expires IS NULL OR expires >= ?)",
+                (ns, key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def range(self, ns: str, key: str, start: int = 0) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT value FROM lists WHERE ns = ? AND key = ? AND NOT EXISTS (
+                    SELECT 1 FROM list_expires e WHERE e.ns = lists.ns AND e.key = lists.key AND e.expires < ?
+                ) ORDER BY id
+                """,
+                (ns, key, time.time()),
+            ).fetchall()
+        return [r[0] for r in rows][start:]
+
+    def take(self, ns: str, key: str, rate: float, burst: float, cost: float) -> bool:
+        now, full = time.time(), burst / rate
+        # One upsert: refill from the time left to expiry, and only write (and return a row) if enough is left
+        refilled = "MIN(:burst, kv.value + MAX(0.0, :full - (kv.expires - :now)) * :rate)"
+        with self._lock:
+            row = self._db.execute(
+                f"""
+                INSERT INTO kv (ns, key, value, expires) VALUES (:ns, :key, :burst - :cost, :now + :full)
+                ON CONFLICT (ns, key) DO UPDATE SET value = {refilled} - :cost, expires = :now + :full
+                    WHERE {refilled} >= :cost
+                RETURNING value
+                """,
+                {"ns": ns, "key": key, "rate": rate, "burst": burst, "cost": cost, "now": now, "full": full},
+            ).fetchone()
+        return row is not None
+
+    def apply(self, ops: list) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for op in ops:
+                    if op[0] == "set":
+                        self._db.execute(
+                            "INSERT OR REPLACE INTO kv (ns, key, value, expires) VALUES (?, ?, ?, ?)", op[1:]
+                        )
+                    elif op[0] == "delete":
+                        self._db.execute("DELETE FROM kv WHERE ns = ? AND key = ?", op[1:3])
+                        self._db.execute("DELETE FROM lists WHERE ns = ? AND key = ?", op[1:3])
+                        self._db.execute("DELETE FROM list_expires WHERE ns = ? AND key = ?", op[1:3])
+                    else:
+                        self._db.execute("INSERT INTO lists (ns, key, value) VALUES (?, ?, ?)", op[1:4])
+                        if op[4]:
+                            self._db.execute(
+                                """
+                                DELETE FROM lists WHERE ns = ? AND key = ? AND id <= (
+                                    SELECT id FROM lists WHERE ns = ? AND key = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+                                )
+                                """,
+                                (op[1], op[2], op[1], op[2], op[4]),
+                            )
+                        if op[5]:
+                            self._db.execute(
+                                "INSERT OR REPLACE INTO list_expires (ns, key, expires) VALUES (?, ?, ?)",
+                                (op[1], op[2], op[5]),
+                            )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def purge(self) -> int:
+        """Delete expired keys and lists; returns how many went."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                keys = self._db.execute("DELETE FROM kv WHERE expires < ?", (now,)).rowcount
+                self._db.execute(
+                    """
+                    DELETE FROM lists WHERE EXISTS (
+                        SELECT 1 FROM list_expires e WHERE e.ns = lists.ns AND e.key = lists.key AND e.expires < ?
+                    )
+                    """,
+                    (now,),
+                )
+                lists = self._db.execute("DELETE FROM list_expires WHERE expires < ?", (now,)).rowcount
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return keys + lists
+
+
+# Token bucket in one Redis key: the value is the tokens left, and the key expires when the bucket would be full
+_TAKE = """
+local rate, burst, cost, full_ms = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = burst
+local value = redis.call('GET', KEYS[1])
+if value then
+    local left_ms = math.max(0, redis.call('PTTL', KEYS[1]))
+    tokens = math.min(burst, tonumber(value) + (full_ms - left_ms) / 1000 * rate)
+end
+if tokens < cost then
+    return 0
+end
+redis.call('SET', KEYS[1], tostring(tokens - cost), 'PX', full_ms)
+return 1
+"""
+
+
+class RedisBackend:
+    shared = True
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("redis:// state URLs need the `redis` package (pip install redis)")
+        self._r = redis.Redis.from_url(url, decode_responses=True)
+        self._take = self._r.register_script(_TAKE)
+
+    @staticmethod
+    def _key(ns: str, key: str) -> str:
+        return f"fh:{ns}:{key}"
+
+    def get(self, ns: str, key: str) -> Optional[str]:
+        return self._r.get(self._key(ns, key))
+
+    def range(self, ns: str, key: str, start: int = 0) -> List[str]:
+        return self._r.lrange(self._key(ns, key), start, -1)
+
+    def take(self, ns: str, key: str, rate: float, burst: float, cost: float) -> bool:
+        # Refills from the key's remaining TTL, so the server's clock is the only one that matters
+        return bool(self._take(keys=[self._key(ns, key)], args=[rate, burst, cost, int(burst / rate * 1000)]))
+
+    def apply(self, ops: list) -> None:
+        pipe = self._r.pipeline(transaction=False)
+        for op in ops:
+            k = self._key(op[1], op[2])
+            if op[0] == "set":
+                ttl = int((op[4] - time.time()) * 1000) if op[4] else None
+                pipe.set(k, op[3], px=max(1, ttl) if ttl is not None else None)
+            elif op[0] == "delete":
+                pipe.delete(k)
+            else:
+                pipe.rpush(k, op[3])
+                if op[4]:
+                    pipe.ltrim(k, -op[4], -1)
+                if op[5]:
+                    pipe.pexpire(k, max(1, int((op[5] - time.time()) * 1000)))
+        pipe.execute()
+
+    def purge(self) -> int:
+        return 0  # Redis expires keys itself
+
+
+def open_backend(url: str):
+    if not url or url.startswith("memory:"):
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"unsupported state URL: {url}")
+
+
+class StateStore:
+    def __init__(
+        self,
+        backend,
+        local_size: int = 4096,
+        local_ttl: float = 2.0,
+        flush_interval: float = 0.1,
+        batch_size: int = 256,
+        purge_interval: float = 60.0,
+    ):
+        """
+        `local_ttl` bounds how stale a locally cached read may be (other workers may have written since);
+        queued writes are flushed every `flush_interval` seconds or as soon as `batch_size` are waiting,
+        and expired keys are purged every `purge_interval` seconds.
+        """
+        self.backend = backend
+        self.shared = backend.shared
+        self.purge_interval = purge_interval
+        self.local_size = local_size
+        self.local_ttl = local_ttl
+        self.batch_size = batch_size
+        self._local = OrderedDict()  # (ns, key) -> (cached_at, value)
+        self._ops = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._run, args=(flush_interval,), name="state-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def get(self, ns: str, key: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._local.get((ns, key))
+            if item is not None and now - item[0] <= self.local_ttl:
+                self._local.move_to_end((ns, key))
+                return item[1]
+        value = self.backend.get(ns, key)
+        if value is not None:
+            self._cache(ns, key, value)
+        return value
+
+    def set(self, ns: str, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self._cache(ns, key, value)
+        self._queue(("set", ns, key, value, time.time() + ttl if ttl else None))
+
+    def delete(self, ns: str, key: str) -> None:
+        with self._lock:
+            self._local.pop((ns, key), None)
+        self._queue(("delete", ns, key))
+
+    def append(self, ns: str, key: str, value: str, cap: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """Append to the list at `key`, keeping only the newest `cap` items; the list expires `ttl` seconds from now."""
+        self._queue(("append", ns, key, value, cap, time.time() + ttl if ttl else None))
+
+    def range(self, ns: str, key: str, start: int = 0) -> List[str]:
+        self.flush()  # the list may have queued appends of our own
+        return self.backend.range(ns, key, start)
+
+    def take(self, ns: str, key: str, rate: float, burst: float, cost: float = 1) -> bool:
+        """
+        Token bucket at `key`: refills at `rate` tokens per second up to `burst`, starting full. Atomically takes
+        `cost` tokens and returns True, or returns False and takes nothing; a full bucket's key expires.
+        """
+        return self.backend.take(ns, key, rate, burst, cost)
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                ops, self._ops = self._ops, []
+            if ops:
+                self.backend.apply(ops)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._wake.set()
+            self.flush()
+
+    def _cache(self, ns: str, key: str, value: str) -> None:
+        with self._lock:
+            self._local[(ns, key)] = (time.monotonic(), value)
+            self._local.move_to_end((ns, key))
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _queue(self, op: tuple) -> None:
+        with self._lock:
+            self._ops.append(op)
+            full = len(self._ops) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _run(self, interval: float) -> None:
+        purged_at = time.monotonic()
+        while not self._closed:
+            self._wake.wait(interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if time.monotonic() - purged_at >= self.purge_interval:
+                    purged_at = time.monotonic()
+                    self.backend.purge()
+            except Exception:
+                time.sleep(interval)  # backend unavailable: the batch is lost, keep serving from memory
@@ -0,0 +1,245 @@
+"""
+Static landing-page renderer.
+
+The page's static parts (style sheet, top bar, hero copy, outcomes, feature
+sections, deals grid) are built from catalog.py into a handful of HTML blocks.
+compile_page() runs once per content hash; app.py caches the result per process
+and emits each block with a single st.markdown call.
+"""
+import functools
+import hashlib
+
+from catalog import DEALS, NAV, OUTCOMES, SECTIONS
+
+STYLE = """
+<style>
+/* --- Page --- */
+section.main { background: #f6f7fb; }
+
+/* --- Top nav --- */
+.topbar{
+  background:#201535; padding:14px 18px; border-radius:12px; color:white;
+  display:flex; justify-content:space-between; align-items:center; margin-bottom:20px;
+}
+.brand{ font-weight:800; font-size:16px; display:flex; gap:10px; align-items:center; }
+.brand-badge{
+  width:26px; height:26px; border-radius:6px; background:#2dd4bf;
+  display:inline-flex; align-items:center; justify-content:center;
+  font-weight:900; color:#0b1020;
+}
+.nav{ font-size:13px; opacity:.95; display:flex; gap:14px; align-items:center; }
+.pill{ background:#2f2350; padding:7px 12px; border-radius:999px; display:inline-block; }
+
+/* --- Hero --- */
+.hero-wrap{ padding:8px 6px 6px 6px; }
+.hero-title{
+  font-family:Georgia,"Times New Roman",serif; font-size:72px; font-weight:700;
+  line-height:.98; color:#0f172a; margin:0;
+}
+.hero-sub{ font-size:16px; color:#475569; margin-top:14px; max-width:620px; }
+.hero-cta-row{ margin-top:16px; display:flex; gap:12px; align-items:center; flex-wrap:wrap; }
+.note{ font-size:12px; color:#64748b; margin-top:10px; }
+
+/* --- New: AI helper text above button --- */
+.ai-helper{
+  font-size:13px;
+  color:#475569;
+  margin-top:10px;
+  max-width:620px;
+}
+.ai-helper b{ color:#0f172a; }
+
+/* --- Video card --- */
+.video-card{
+  background:#5b77f4; border-radius:18px; height:240px;
+  display:flex; align-items:center; justify-content:center;
+  color:white; font-size:26px; font-weight:800;
+  border:1px solid rgba(0,0,0,.05);
+}
+
+/* --- Outcomes strip --- */
+.outcomes-wrap{
+  background:white;
+  border:1px solid #ececf3;
+  border-radius:22px;
+  padding:22px;
+  margin-top:18px;
+}
+.outcomes-grid{
+  display:grid;
+  grid-template-columns:repeat(4,1fr);
+  gap:16px;
+}
+@media (max-width:900px){
+  .outcomes-grid{ grid-template-columns:repeat(2,1fr); }
+}
+@media (max-width:500px){
+  .outcomes-grid{ grid-template-columns:1fr; }
+}
+.outcome-card{
+  background:#f6f7fb;
+  border-radius:18px;
+  padding:18px;
+}
+.outcome-value{
+  font-size:28px;
+  font-weight:900;
+  color:#0f172a;
+}
+.outcome-label{
+  font-size:14px;
+  color:#475569;
+  margin-top:6px;
+}
+
+/* --- Sections --- */
+.section-card{
+  background:white; border:1px solid #ececf3; border-radius:22px;
+  padding:22px; margin-top:18px;
+}
+.section-kicker{
+  font-size:12px; letter-spacing:.14em; color:#64748b; font-weight:800;
+}
+.section-title{
+  font-family:Georgia,"Times New Roman",serif; font-size:54px; font-weight:700;
+  line-height:1.02; color:#0f172a; margin:8px 0 10px 0; white-space:pre-line;
+}
+.feature{ margin-top:14px; }
+.feature b{ font-size:16px; font-weight:700; color:#0f172a; }
+.feature .desc{ margin-left:18px; margin-top:4px; color:#475569; font-size:14px; }
+.linkish{ color:#2563eb; font-weight:700; margin-top:14px; }
+
+/* --- AI sidebar card (multi-color) --- */
+.ai-card{
+  background:linear-gradient(135deg,#eef2ff 0%, #f0fdf4 50%, #fff7ed 100%);
+  border:1px solid #e5e7eb; border-radius:16px; padding:14px; margin-bottom:12px;
+}
+.ai-title{ font-size:18px; font-weight:900; color:#0f172a; margin:0 0 6px 0; }
+.ai-desc{ font-size:13px; color:#334155; line-height:1.45; margin:0; }
+.ai-highlight{ color:#2563eb; font-weight:900; }
+.ai-note{ font-size:12px; color:#64748b; margin-top:8px; }
+
+/* --- End-page deals section (WalletHub-like) --- */
+.deals-wrap{ margin-top:34px; padding:10px 0 6px 0; }
+.deals-kicker{
+  font-size:12px; letter-spacing:.14em; color:#0f172a; font-weight:800; text-align:center;
+}
+.deals-title{
+  font-family:Georgia,"Times New Roman",serif; font-size:64px; font-weight:700;
+  line-height:1.03; color:#0f172a; text-align:center; margin-top:8px;
+}
+.deals-sub{
+  font-size:15px; color:#475569; text-align:center;
+  max-width:720px; margin:12px auto 0 auto;
+}
+.deals-grid{
+  max-width:980px; margin:24px auto 0 auto;
+  display:grid; grid-template-columns:repeat(3, 1fr); gap:18px;
+}
+@media (max-width:900px){ .deals-grid{ grid-template-columns:repeat(2, 1fr); } }
+@media (max-width:600px){ .deals-grid{ grid-template-columns:1fr; } }
+.deal-card{
+  background:#f3f5f9; border:1px solid #edf0f6; border-radius:22px;
+  padding:18px 14px; height:150px;
+  display:flex; flex-direction:column; justify-content:center; align-items:center;
+}
+.deal-icon{
+  width:54px; height:54px; border-radius:18px; background:white;
+  border:1px solid #e7eaf2;
+  display:flex; align-items:center; justify-content:center;
+  font-size:28px; margin-bottom:10px;
+}
+.deal-label{ font-size:20px; color:#0f172a; font-weight:500; }
+.deals-cta{ display:flex; justify-content:center; margin-top:22px; }
+.wallethub-btn button{
+  background:#201535 !important; color:white !important;
+  border-radius:999px !important; padding:0.65rem 1.6rem !important;
+  font-weight:700 !important; border:none !important;
+}
+</style>
+"""
+
+
+def section_html(section_id: str, kicker: str, title: str, features: list, footer: str = "View all features →") -> str:
+    feats = "".join(
+        f'<div class="feature"><b>＋ {name}</b><div class="desc">{desc}</div></div>' for name, desc in features
+    )
+    return (
+        f'<div id="{section_id}"></div>'
+        f'<div class="section-card"><div class="section-kicker">{kicker}</div>'
+        f'<div class="section-title">{title}</div>{feats}'
+        f'<div class="linkish">{footer}</div></div>'
+    )
+
+
+def _topbar_html() -> str:
+    nav = "".join(f"<span>{item}</span>" for item in NAV)
+    return (
+        '<div class="topbar"><div class="brand"><span class="brand-badge">W</span> FinanceHub</div>'
+        f'<div class="nav">{nav}<span class="pill">Login</span><span class="pill">Sign Up</span></div></div>'
+    )
+
+
+def _hero_html() -> str:
+    return (
+        '<div class="hero-wrap"><p class="hero-title">Supercharge<br/>Your Finances</p>'
+        '<div class="hero-sub">FinanceHub helps you make the most of your money. '
+        'Strengthen your credit, budget better, track offers, monitor investments, '
+        'and protect your identity — all in one place.</div>'
+        '<div class="ai-helper"><b>AI-Assisted Onboarding:</b> Our optional AI assistant helps new users '
+        'understand financial concepts, explains features in context, and guides exploration '
+        'in simple, plain English.</div></div>'
+    )
+
+
+def _outcomes_html() -> str:
+    cards = "".join(
+        f'<div class="outcome-card"><div class="outcome-value">{value}</div>'
+        f'<div class="outcome-label">{label}</div></div>'
+        for value, label in OUTCOMES
+    )
+    return (
+        '<div class="outcomes-wrap"><div class="section-kicker">KEY FINANCIAL OUTCOMES</div>'
+        f'<div class="outcomes-grid">{cards}</div></div>'
+    )
+
+
+def _advanced_html() -> str:
+    return (
+        '<div class="section-card"><div class="section-kicker">ADVANCED USERS</div>'
+        '<div class="section-title">Download detailed\nfinancial insights</div>'
+        '<div class="hero-sub">For users who want deeper analysis, detailed explanations, and methodology, '
+        'we provide optional downloadable resources without cluttering the main interface.</div></div>'
+    )
+
+
+def _deals_html() -> str:
+    cards = "".join(
+        f'<div class="deal-card"><div class="deal-icon">{icon}</div><div class="deal-label">{label}</div></div>'
+        for icon, label in DEALS
+    )
+    return (
+        '<div class="deals-wrap"><div class="deals-kicker">SAVINGS OPPORTUNITIES</div>'
+        '<div class="deals-title">Find the Best Deals</div>'
+        '<div class="deals-sub">People trust FinanceHub because of its user reviews, unbiased recommendations, '
+        'and transparent rating logic designed to help you compare options confidently.</div>'
+        f'<div class="deals-grid">{cards}</div></div>'
+    )
+
+
+# Changes to the catalog or the style sheet produce a new hash, which invalidates compiled pages
+CONTENT_HASH = hashlib.sha256(repr((STYLE, NAV, OUTCOMES, SECTIONS, DEALS)).encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=4)
+def compile_page(content_hash: str = CONTENT_HASH) -> dict:
+    """Named HTML blocks for the static parts of the page, in render order."""
+    return {
+        "style": STYLE,
+        "topbar": _topbar_html(),
+        "hero": _hero_html(),
+        "outcomes": _outcomes_html(),
+        "sections": "".join(section_html(*s) for s in SECTIONS),
+        "advanced": _advanced_html(),
+        "deals": _deals_html(),
+    }
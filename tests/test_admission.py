@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, Busy
+
+
+def _queue(ctl, session, order):
+    """Start a thread that waits for a slot for `session`; returns once it is queued."""
+    queued = ctl.queued
+
+    def worker():
+        ctl.acquire(session, timeout=5)
+        order.append(session)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    while ctl.queued == queued:
+        time.sleep(0.001)
+    return t
+
+
+def test_free_slots_admit_without_waiting():
+    ctl = AdmissionController(max_inflight=2)
+    assert ctl.acquire("a") == 0.0
+    assert ctl.acquire("b") == 0.0
+    assert ctl.stats() == {"inflight": 2, "queued": 0, "sessions_waiting": 0}
+
+
+def test_full_queue_fails_fast():
+    ctl = AdmissionController(max_inflight=1, max_queue=1)
+    ctl.acquire("a")
+    t = _queue(ctl, "a", [])
+    with pytest.raises(Busy) as e:
+        ctl.acquire("b")
+    assert e.value.reason == "queue_full"
+    ctl.release()
+    t.join(5)
+
+
+def test_timed_out_waiter_leaves_the_queue():
+    ctl = AdmissionController(max_inflight=1)
+    ctl.acquire("a")
+    with pytest.raises(Busy) as e:
+        ctl.acquire("b", timeout=0.05)
+    assert e.value.reason == "timeout" and e.value.waited >= 0.05
+    assert ctl.stats() == {"inflight": 1, "queued": 0, "sessions_waiting": 0}
+    ctl.release()
+    assert ctl.stats()["inflight"] == 0
+
+
+def test_queue_is_served_round_robin_across_sessions():
+    ctl = AdmissionController(max_inflight=1)
+    ctl.acquire("busy")
+    order = []
+    threads = [_queue(ctl, s, order) for s in ("a", "a", "a", "b")]
+    for _ in threads:
+        ctl.release()
+        time.sleep(0.02)
+    for t in threads:
+        t.join(5)
+    assert order == ["a", "b", "a", "a"]
+    assert ctl.stats() == {"inflight": 1, "queued": 0, "sessions_waiting": 0}
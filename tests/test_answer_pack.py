@@ -0,0 +1,29 @@
+import build_answer_pack
+from answer_cache import cache_key
+from answer_pack import AnswerPack, write_pack
+from prompt import PROMPT_VERSION
+
+
+def test_mock_build_round_trips_through_the_pack(tmp_path):
+    corpus = tmp_path / "questions.txt"
+    corpus.write_text("How do I improve my credit score?\n# comment\n\nWhere do I set a budget?\n", encoding="utf-8")
+    out = tmp_path / "pack.bin"
+    assert build_answer_pack.main([str(corpus), "--mock", "-o", str(out), "--model", "gpt-4o-mini"]) == 0
+    pack = AnswerPack(str(out))
+    assert pack.meta["mock"] is True and pack.meta["entries"] == 2
+    assert pack.meta["model"] == "gpt-4o-mini" and pack.meta["prompt_version"] == PROMPT_VERSION
+    for q in ("How do I improve my credit score?", "Where do I set a budget?"):
+        assert pack.get(cache_key(q, "gpt-4o-mini", PROMPT_VERSION))
+    assert pack.get(cache_key("Something never asked", "gpt-4o-mini", PROMPT_VERSION)) is None
+
+
+def test_app_never_serves_a_mock_pack(tmp_path):
+    import assistant
+
+    key = cache_key("How do I improve my credit score?", assistant.MODEL, assistant.PROMPT_VERSION)
+    meta = {"model": assistant.MODEL, "prompt_version": assistant.PROMPT_VERSION}
+    real, mock = tmp_path / "real.bin", tmp_path / "mock.bin"
+    write_pack(str(real), {key: "answer"}, {**meta, "mock": False})
+    write_pack(str(mock), {key: "answer"}, {**meta, "mock": True})
+    assert assistant.get_answer_pack(str(real)).get(key) == "answer"
+    assert assistant.get_answer_pack(str(mock)) is None
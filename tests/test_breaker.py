@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+
+
+def _breaker(**kw):
+    changes = []
+    kw.setdefault("min_calls", 4)
+    kw.setdefault("open_for", 0.05)
+    b = CircuitBreaker(on_change=lambda old, new: changes.append(new), **kw)
+    return b, changes
+
+
+def _fail(b):
+    with pytest.raises(RuntimeError):
+        with b.call():
+            raise RuntimeError("upstream failed")
+
+
+def test_stays_closed_below_min_calls():
+    b, _ = _breaker()
+    for _ in range(3):
+        _fail(b)
+    assert b.state == CLOSED
+
+
+def test_opens_on_failure_rate_and_fails_fast():
+    b, changes = _breaker()
+    for _ in range(2):
+        with b.call():
+            pass
+    for _ in range(2):
+        _fail(b)
+    assert b.state == OPEN and changes == [OPEN]
+    ran = []
+    with pytest.raises(CircuitOpen):
+        with b.call():
+            ran.append(1)
+    assert ran == []
+
+
+def test_opens_on_slow_calls():
+    b, _ = _breaker(slow_call=0.01)
+    for _ in range(4):
+        b.allow()
+        b.record(True, 0.02)
+    assert b.state == OPEN
+
+
+def test_healthy_probe_closes_and_bad_probe_reopens():
+    b, changes = _breaker()
+    for _ in range(4):
+        _fail(b)
+    time.sleep(0.06)
+    assert b.allow() and b.state == HALF_OPEN
+    assert not b.allow()  # one probe at a time
+    b.record(False, 0.0)
+    assert b.state == OPEN
+    time.sleep(0.06)
+    with b.call():
+        pass
+    assert b.state == CLOSED
+    assert changes == [OPEN, HALF_OPEN, OPEN, HALF_OPEN, CLOSED]
+
+
+def test_abandoned_probe_frees_its_slot():
+    b, _ = _breaker()
+    for _ in range(4):
+        _fail(b)
+    time.sleep(0.06)
+    assert b.allow()
+    b.record(None, 0.0)
+    assert b.state == HALF_OPEN and b.allow()
+
+
+def test_call_with_an_earlier_allow_does_not_take_a_second_probe():
+    b, _ = _breaker()
+    for _ in range(4):
+        _fail(b)
+    time.sleep(0.06)
+    assert b.allow()
+    with b.call(allowed=True):
+        pass
+    assert b.state == CLOSED
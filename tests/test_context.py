@@ -0,0 +1,34 @@
+from chat_history import ChatHistory, Turn
+from context import RollingSummary, build_context, messages_tokens
+
+
+def _turns(n):
+    return [Turn("You" if i % 2 == 0 else "AI", f"turn {i} " + "word " * 20, ts=float(i + 1)) for i in range(n)]
+
+
+def test_since_reaches_into_the_archive():
+    chat = ChatHistory(max_turns=5)
+    for turn in _turns(30):
+        chat._add(turn)
+    assert [t.ts for t in chat.since(10.0)] == [float(i) for i in range(11, 31)]
+    assert chat.since(30.0) == []
+
+
+def test_every_turn_is_sent_or_overflows_into_the_summary():
+    turns = _turns(60)
+    base = [{"role": "system", "content": "prefix"}, {"role": "user", "content": "question"}]
+    messages, overflow = build_context(base, turns, RollingSummary(), budget=400)
+    sent = len(messages) - len(base)
+    assert messages_tokens(messages) <= 400
+    assert sent + len(overflow) == len(turns)
+    assert overflow == turns[: len(overflow)]
+
+
+def test_turns_covered_by_the_summary_are_skipped():
+    summary = RollingSummary()
+    summary.text, summary.upto_ts = "They asked about credit.", 50.0
+    base = [{"role": "system", "content": "prefix"}, {"role": "user", "content": "question"}]
+    messages, overflow = build_context(base, _turns(60), summary, budget=2000)
+    assert overflow == []
+    assert messages[1]["content"].startswith("Summary of the earlier conversation")
+    assert len(messages) == len(base) + 1 + 10
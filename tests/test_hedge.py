@@ -0,0 +1,91 @@
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hedge import HedgeBudget, LatencyTracker, arace, race
+
+
+def _attempts(*delays):
+    """An attempt() whose n-th call sleeps delays[n] and returns n."""
+    counter = itertools.count()
+
+    def attempt():
+        n = next(counter)
+        time.sleep(delays[n])
+        return n
+
+    return attempt
+
+
+def test_budget_caps_hedges_at_ratio_of_requests():
+    budget = HedgeBudget(ratio=0.25, burst=1.0)
+    spent = 0
+    for _ in range(100):
+        budget.request()
+        spent += budget.try_spend()
+    assert spent == 25 and budget.hedges == 25
+
+
+def test_latency_percentile_uses_default_until_enough_samples():
+    tracker = LatencyTracker(size=8, default=2.0, min_samples=4)
+    for s in (0.1, 0.2, 0.3):
+        tracker.add(s)
+    assert tracker.percentile(95) == 2.0
+    for s in range(20):
+        tracker.add(1.0)
+    assert tracker.percentile(50) == 1.0
+
+
+def test_fast_call_is_not_hedged():
+    budget = HedgeBudget(ratio=1.0, burst=1.0)
+    with ThreadPoolExecutor(2) as pool:
+        assert race(_attempts(0.0), 0.5, budget, pool) == (0, None)
+    assert budget.hedges == 0
+
+
+def test_hedge_wins_over_slow_primary_and_loser_is_discarded():
+    budget, discarded = HedgeBudget(ratio=1.0, burst=1.0), []
+    done = threading.Event()
+    with ThreadPoolExecutor(2) as pool:
+        result = race(_attempts(0.5, 0.0), 0.05, budget, pool, discard=lambda r: (discarded.append(r), done.set()))
+        assert result == (1, True)
+        assert done.wait(2)
+    assert discarded == [0]
+
+
+def test_no_hedge_without_budget():
+    budget = HedgeBudget(ratio=0.5, burst=1.0)
+    with ThreadPoolExecutor(2) as pool:
+        assert race(_attempts(0.1), 0.01, budget, pool) == (0, None)
+
+
+def test_error_is_raised_only_when_both_attempts_fail():
+    budget = HedgeBudget(ratio=1.0, burst=1.0)
+
+    def attempt():
+        time.sleep(0.05)
+        raise RuntimeError("down")
+
+    with ThreadPoolExecutor(2) as pool, pytest.raises(RuntimeError):
+        race(attempt, 0.01, budget, pool)
+
+
+def test_arace_cancels_the_loser():
+    budget, cancelled = HedgeBudget(ratio=1.0, burst=1.0), []
+    delays = iter((0.5, 0.0))
+
+    async def attempt():
+        delay = next(delays)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert asyncio.run(arace(attempt, 0.05, budget)) == (0.0, True)
+    assert cancelled == [0.5]
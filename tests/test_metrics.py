@@ -0,0 +1,94 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+import metrics
+from metrics import Registry
+
+
+def _lines(registry):
+    return registry.render().splitlines()
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    reg = Registry(enabled=True)
+    for value in (0.0005, 0.003, 0.003, 0.7, 100.0):
+        reg.observe("ai_stage_seconds", value, stage="upstream")
+    lines = _lines(reg)
+    assert "# TYPE ai_stage_seconds histogram" in lines
+    assert any(line.startswith("# HELP ai_stage_seconds ") for line in lines)
+    buckets = [line for line in lines if line.startswith("ai_stage_seconds_bucket")]
+    assert len(buckets) == len(metrics.BUCKETS) + 1
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert 'ai_stage_seconds_bucket{stage="upstream",le="0.001"} 1' in lines
+    assert 'ai_stage_seconds_bucket{stage="upstream",le="0.005"} 3' in lines
+    assert 'ai_stage_seconds_bucket{stage="upstream",le="1.0"} 4' in lines
+    assert 'ai_stage_seconds_bucket{stage="upstream",le="+Inf"} 5' in lines
+    assert 'ai_stage_seconds_count{stage="upstream"} 5' in lines
+    (total,) = [line for line in lines if line.startswith("ai_stage_seconds_sum")]
+    assert float(total.rsplit(" ", 1)[1]) == pytest.approx(100.7065)
+
+
+def test_counters_gauges_and_label_escaping():
+    reg = Registry(enabled=True)
+    reg.inc("ai_answers_total", source="cache")
+    reg.inc("ai_answers_total", 2, source="cache")
+    reg.set("ai_prompt_info", 1, version='v"2\\x\ny')
+    lines = _lines(reg)
+    assert "# TYPE ai_answers_total counter" in lines
+    assert 'ai_answers_total{source="cache"} 3' in lines
+    assert "# TYPE ai_prompt_info gauge" in lines
+    assert 'ai_prompt_info{version="v\\"2\\\\x\\ny"} 1' in lines
+
+
+def test_collectors_run_before_each_render():
+    reg = Registry(enabled=True)
+    calls = []
+    reg.collect(lambda: (calls.append(1), reg.set("ai_cache_entries", len(calls), cache="answers")))
+    assert 'ai_cache_entries{cache="answers"} 1' in _lines(reg)
+    assert 'ai_cache_entries{cache="answers"} 2' in _lines(reg)
+
+
+def test_disabled_registry_records_nothing():
+    seen = []
+    reg = Registry(sink=lambda *args: seen.append(args))
+    reg.inc("ai_answers_total", source="cache")
+    reg.set("ai_breaker_state", 2)
+    reg.observe("ai_queue_seconds", 0.1)
+    with reg.timer("ai_stage_seconds", stage="prompt"):
+        pass
+    assert reg.timer("ai_stage_seconds") is metrics._NOOP
+    assert reg.render() == "\n" and seen == []
+
+
+def test_serve_exposes_metrics_and_views():
+    reg = Registry(enabled=True)
+    reg.inc("ai_answers_total", source="router")
+    server = metrics.serve(reg, 0, host="127.0.0.1", views={"/sessions": lambda: {"active": 1}})
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(base + "/metrics") as r:
+            assert r.headers["Content-Type"].startswith("text/plain")
+            assert 'ai_answers_total{source="router"} 1' in r.read().decode()
+        with urllib.request.urlopen(base + "/sessions") as r:
+            assert json.loads(r.read()) == {"active": 1}
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(base + "/nope")
+    finally:
+        server.shutdown()
+
+
+def test_registering_a_collector_twice_runs_it_once():
+    reg = Registry(enabled=True)
+    calls = []
+
+    def collector():
+        calls.append(1)
+
+    reg.collect(collector)
+    reg.collect(collector)
+    reg.render()
+    assert calls == [1]
@@ -0,0 +1,159 @@
+"""
+Golden-corpus equivalence of postprocess.py with the original app.py helpers.
+
+The reference implementation below is the original code, unchanged; every
+output of the single-pass engine must match it byte for byte. Timings are in
+test_postprocess_bench.py.
+"""
+import random
+import re
+
+import pytest
+
+from postprocess import MAX_CHARS, StreamingAnswer, cap_to_4_sentences, format_answer, natural_segment
+
+
+# --------------------------------------------------
+# Reference implementation (the original app.py helpers, unchanged)
+# --------------------------------------------------
+def _legacy_cap_to_4_sentences(text: str) -> str:
+    if not text:
+        return text
+    t = re.sub(r"\s+", " ", text).strip()
+    parts = re.split(r"(?<=[.!?])\s+", t)
+    capped = " ".join(parts[:4]).strip()
+    if capped == t and len(parts) <= 1 and len(capped) > 420:
+        capped = capped[:420].rsplit(" ", 1)[0] + "…"
+    return capped
+
+def _legacy_natural_segment(text: str) -> str:
+    if not text:
+        return text
+    s = re.sub(r"\s+", " ", text).strip()
+    s = re.sub(
+        r"\s-\s+(Budgeting|Credit|Offers|Investments|Identity)\s*:",
+        r"\n\n- \1:",
+        s,
+        flags=re.I,
+    )
+    sentences = re.split(r"(?<=[.!?])\s+", s)
+    blocks, current = [], ""
+    for sent in sentences:
+        sent = sent.strip()
+        if not sent:
+            continue
+        if sent.startswith("- "):
+            if current:
+                blocks.append(current.strip())
+                current = ""
+            blocks.append(sent)
+            continue
+        current = (current + " " + sent).strip() if current else sent
+        if len(re.split(r"(?<=[.!?])\s+", current)) >= 2:
+            blocks.append(current.strip())
+            current = ""
+    if current:
+        blocks.append(current.strip())
+    out = "\n\n".join(blocks)
+    out = re.sub(r"\n{3,}", "\n\n", out).strip()
+    return out
+
+
+# --------------------------------------------------
+# Golden corpus
+# --------------------------------------------------
+GOLDEN = [
+    "",
+    "   ",
+    "Start with [Budgeting & Spending](#budgeting).",
+    "Great question! A credit score is a number that summarizes how reliably you repay debt. "
+    "Lenders use it to decide rates. You can learn more in [Improve your credit & save](#credit). "
+    "Want tips on raising it?",
+    "Here's a quick tour:\n\n - Budgeting: track spending in [Budgeting & Spending](#budgeting).\n"
+    " - Credit: see your score in [Improve your credit & save](#credit).\n"
+    " - offers : compare cards in [Offers](#offers).\n - Investments: [Investments](#investments). "
+    " - Identity: [Identity](#identity).",
+    "Where to start depends on your goal. If you want to spend less, open [Budgeting & Spending](#budgeting). "
+    "If you want better rates, check [Improve your credit & save](#credit)!  Are you focused on saving or borrowing? "
+    "This fifth sentence gets cut. So does this one.",
+    "A very long answer without any sentence ending " + "that keeps going and going " * 30,
+    "Start here - Credit: check your score first. Then - Offers: compare cards.",
+    "Wait... what?! Really? Yes.\tNo.\nMaybe.",
+    "Tabs\tand\nnewlines\r\nand\u00a0non-breaking\u2003spaces.\x1cSecond sentence! Third?",
+]
+
+
+def _random_answer(rng: random.Random, n_words: int) -> str:
+    words = ["credit", "score", "Budgeting", "Offers", "-", "Identity:", "Investments", ":",
+             "[Offers](#offers)", "the", "app", "helps", "you", "track", "spending"]
+    ends = [".", "!", "?", "", "", "", "", "..."]
+    spaces = [" ", " ", " ", "  ", "\n", "\t", " - "]
+    out = []
+    for _ in range(n_words):
+        out.append(rng.choice(words) + rng.choice(ends) + rng.choice(spaces))
+    return "".join(out)
+
+
+def corpus() -> list:
+    rng = random.Random(1234)
+    texts = list(GOLDEN)
+    texts += [_random_answer(rng, rng.randint(1, 40)) for _ in range(2000)]
+    texts += [_random_answer(rng, 5000) for _ in range(5)]  # long outputs
+    return texts
+
+
+def legacy_format(text: str) -> str:
+    return _legacy_natural_segment(_legacy_cap_to_4_sentences(text))
+
+
+CORPUS = corpus()
+
+
+def test_format_answer_matches_legacy():
+    mismatches = [t for t in CORPUS if format_answer(t) != legacy_format(t)]
+    assert not mismatches, f"{len(mismatches)} of {len(CORPUS)} differ, first: {mismatches[0][:80]!r}"
+
+
+def test_cap_matches_legacy():
+    mismatches = [t for t in CORPUS if cap_to_4_sentences(t) != _legacy_cap_to_4_sentences(t)]
+    assert not mismatches, f"{len(mismatches)} of {len(CORPUS)} differ, first: {mismatches[0][:80]!r}"
+
+
+def test_segment_matches_legacy():
+    mismatches = [t for t in CORPUS if natural_segment(t) != _legacy_natural_segment(t)]
+    assert not mismatches, f"{len(mismatches)} of {len(CORPUS)} differ, first: {mismatches[0][:80]!r}"
+
+
+def _stream(text: str, chunk: int = 7) -> StreamingAnswer:
+    answer = StreamingAnswer()
+    for i in range(0, len(text), chunk):
+        if answer.feed(text[i:i + chunk]):
+            break
+    return answer
+
+
+@pytest.mark.parametrize("text", [t for t in GOLDEN if t.strip()])
+def test_streamed_answer_formats_like_full_answer(text):
+    assert _stream(text).final() == format_answer(text)
+
+
+def test_stream_stops_after_fourth_sentence():
+    answer = _stream("One. Two! Three? Four. Five. Six.")
+    assert answer.done
+    assert answer.final() == format_answer("One. Two! Three? Four.")
+
+
+def test_run_on_stream_stops_past_max_chars():
+    text = "and it keeps going " * 200
+    answer = _stream(text)
+    assert answer.done
+    assert len(answer.text) < MAX_CHARS + 10
+    assert answer.final() == format_answer(text)
+
+
+@pytest.mark.parametrize("text", ["word\n\n" * 200, "- item one\n  - item two \t\n" * 60, "\n\n  lead " * 150])
+def test_run_on_stream_measures_collapsed_whitespace(text):
+    answer = _stream(text)
+    assert answer.done
+    assert answer.final() == format_answer(text)
+    assert answer.final().endswith("…")
@@ -0,0 +1,49 @@
+"""
+Timings of postprocess.py against the original helpers (pytest-benchmark).
+
+    pytest tests/test_postprocess_bench.py --benchmark-only
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from postprocess import format_answer, natural_segment  # noqa: E402
+from test_postprocess import CORPUS, _legacy_natural_segment, legacy_format  # noqa: E402
+
+SHORT = CORPUS[:-5]
+LONG = CORPUS[-5:]
+
+
+def _all(fn, texts):
+    return lambda: [fn(t) for t in texts]
+
+
+@pytest.mark.benchmark(group="short")
+def test_short_legacy(benchmark):
+    benchmark(_all(legacy_format, SHORT))
+
+
+@pytest.mark.benchmark(group="short")
+def test_short(benchmark):
+    benchmark(_all(format_answer, SHORT))
+
+
+@pytest.mark.benchmark(group="long")
+def test_long_legacy(benchmark):
+    benchmark(_all(legacy_format, LONG))
+
+
+@pytest.mark.benchmark(group="long")
+def test_long(benchmark):
+    benchmark(_all(format_answer, LONG))
+
+
+# Segmenting a long, uncapped answer is where the old per-sentence re-split was quadratic
+@pytest.mark.benchmark(group="segment")
+def test_segment_legacy(benchmark):
+    benchmark.pedantic(_all(_legacy_natural_segment, LONG), rounds=3)
+
+
+@pytest.mark.benchmark(group="segment")
+def test_segment(benchmark):
+    benchmark(_all(natural_segment, LONG))
@@ -0,0 +1,117 @@
+import threading
+import time
+
+from hedge import HedgeBudget
+from prefetch import QUESTION, Prefetcher, predict
+
+SECTIONS = [
+    ("budgeting", "Budgeting & Spending", "", [("Monthly budget", ""), ("Spending alerts", "")]),
+    ("credit", "Improve your credit & save", "", [("Credit card tips", ""), ("Score simulator", ""), ("Savings goals", "")]),
+]
+
+
+def test_predict_ranks_the_newest_linked_section_and_the_last_questions_words():
+    turns = [
+        ("You", "where do I set a budget"),
+        ("AI", "Use [Budgeting & Spending](#budgeting)."),
+        ("You", "what moves my score"),
+        ("AI", "See [Improve your credit & save](#credit)."),
+    ]
+    assert predict(turns, SECTIONS, k=3) == [
+        QUESTION.format("Score simulator"),  # newest section, and shares "score" with the last question
+        QUESTION.format("Credit card tips"),
+        QUESTION.format("Savings goals"),
+    ]
+    assert predict(turns, SECTIONS, asked=[QUESTION.format("Score simulator").upper()], k=1) == [
+        QUESTION.format("Credit card tips")
+    ]
+    assert predict([("You", "hi"), ("AI", "Hello!")], SECTIONS) == []
+
+
+def _budget(credit):
+    budget = HedgeBudget(ratio=1.0, burst=10)
+    budget.credit = credit
+    return budget
+
+
+def _prefetcher(fetch=lambda q: f"answer to {q}", cached=lambda q: False, budget=None, **kw):
+    outcomes = []
+    p = Prefetcher(fetch, cached, budget or _budget(10), on_outcome=outcomes.append, **kw)
+    return p, outcomes
+
+
+def _drain(p):
+    p._pool.shutdown(wait=True)
+
+
+def test_fetched_answer_is_claimed_once():
+    p, outcomes = _prefetcher()
+    p.submit("s", ["q1"])
+    _drain(p)
+    assert outcomes == ["fetched"]
+    assert p.claim("answer to q1") and not p.claim("answer to q1")
+    assert not p.claim("some other answer")
+    assert p.stats()["hits"] == 1 and p.stats()["hit_rate"] == 1.0
+
+
+def test_budget_cached_and_busy_jobs_never_fetch():
+    fetched = []
+    p, outcomes = _prefetcher(fetch=fetched.append, budget=_budget(1), workers=1)
+    p.submit("s", ["q1", "q2"])
+    _drain(p)
+    assert outcomes == ["fetched", "budget"] and fetched == ["q1"]
+
+    p, outcomes = _prefetcher(fetch=fetched.append, cached=lambda q: True)
+    p.submit("s", ["q3"])
+    _drain(p)
+    p2, outcomes2 = _prefetcher(fetch=fetched.append, idle=lambda: False)
+    p2.submit("s", ["q4"])
+    _drain(p2)
+    assert outcomes == ["cached"] and outcomes2 == ["busy"] and fetched == ["q1"]
+
+
+def test_fetch_errors_are_counted():
+    def fail(q):
+        raise RuntimeError("upstream failed")
+
+    p, outcomes = _prefetcher(fetch=fail)
+    p.submit("s", ["q1"])
+    _drain(p)
+    assert outcomes == ["error"] and p.stats()["outcomes"] == {"error": 1}
+
+
+def _blocked(**kw):
+    """A one-worker prefetcher whose worker is stuck on its first job until the returned event is set."""
+    release = threading.Event()
+    started = threading.Event()
+    fetched = []
+
+    def fetch(q):
+        started.set()
+        release.wait(5)
+        fetched.append(q)
+        return q
+
+    p, outcomes = _prefetcher(fetch=fetch, workers=1, **kw)
+    p.submit("blocker", ["first"])
+    assert started.wait(5)
+    return p, outcomes, release, fetched
+
+
+def test_resubmitting_or_cancelling_drops_queued_jobs():
+    p, outcomes, release, fetched = _blocked()
+    p.submit("s", ["q1", "q2"])
+    p.submit("s", ["q3"])  # a newer question supersedes the queued ones
+    p.cancel("s")
+    release.set()
+    _drain(p)
+    assert sorted(outcomes) == ["cancelled"] * 3 + ["fetched"] and fetched == ["first"]
+
+
+def test_jobs_waiting_too_long_go_stale_and_a_full_queue_drops():
+    p, outcomes, release, fetched = _blocked(max_wait=0.01, max_pending=2)
+    p.submit("s", ["q1", "q2", "q3"])  # the blocker holds one of the two pending places
+    time.sleep(0.05)
+    release.set()
+    _drain(p)
+    assert sorted(outcomes) == ["dropped", "dropped", "fetched", "stale"] and fetched == ["first"]
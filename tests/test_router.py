@@ -0,0 +1,45 @@
+import pytest
+
+from catalog import SECTION_LINKS, SECTIONS
+from prefetch import QUESTION
+from router import IntentRouter
+
+ROUTER = IntentRouter(SECTIONS, SECTION_LINKS, threshold=0.5)
+
+# (question, feature the local answer must be about)
+NAVIGATION = [
+    ("Where do I track subscriptions?", "Subscription Manager"),
+    ("Where can I find the spending tracker?", "Spending Tracker"),
+    ("What is Credit Lock?", "Credit Lock"),
+    ("What's the Debt Payoff Plan?", "Debt Payoff Plan"),
+    ("Which section has Dark Web Monitoring?", "Dark Web Monitoring"),
+    ("Where is identity monitoring?", "Identity Monitoring"),
+    ("Show me Net Worth", "Net Worth"),
+    ("Where do I see my investments performance?", "Investment Monitoring"),
+]
+
+# Questions about concepts, or follow-ups the model should answer
+EDUCATIONAL = [
+    "What is a good credit score?",
+    "Should I open a credit card to build credit?",
+    "What happens if my identity is stolen?",
+    "What should I do about my debt?",
+    "How do I improve my credit?",
+    "Explain what a credit score is in simple English.",
+    "Where should I start?",
+    "What is an index fund?",
+    "Which card is better for cash back?",
+    "Is a credit freeze the same as a lock?",
+    QUESTION.format("Credit Lock"),
+]
+
+
+@pytest.mark.parametrize("question, feature", NAVIGATION)
+def test_navigation_questions_are_answered_locally(question, feature):
+    answer = ROUTER.route(question)
+    assert answer is not None and answer.startswith(f"**{feature}**")
+
+
+@pytest.mark.parametrize("question", EDUCATIONAL)
+def test_educational_questions_go_to_the_model(question):
+    assert ROUTER.route(question) is None
@@ -0,0 +1,38 @@
+import time
+
+from semantic_cache import SemanticCache
+
+
+def test_paraphrase_hits_and_unrelated_question_misses():
+    cache = SemanticCache(capacity=100)
+    cache.add("How do I improve my credit score?", "answer")
+    assert cache.lookup("how do i improve my credit scores") == "answer"
+    assert cache.lookup("Where do I set a monthly budget?") is None
+
+
+def test_entries_expire_after_ttl_and_keep_their_stored_time():
+    cache = SemanticCache(capacity=100, ttl=60)
+    cache.add("How do I improve my credit score?", "fresh")
+    cache.add("Where do I set a monthly budget?", "old", stored_at=time.time() - 120)
+    (question, answer, stored_at), = cache.lookup_entries(["how do I improve my credit score"])
+    assert question == "How do I improve my credit score?" and answer == "fresh" and time.time() - stored_at < 5
+    assert cache.lookup("Where do I set a monthly budget?") is None
+
+
+def test_full_cache_reuses_evicted_rows_without_growing():
+    cache = SemanticCache(capacity=50)
+    for i in range(500):
+        cache.add(f"question number {i} about credit cards", f"answer {i}")
+        assert len(cache) <= 50
+    assert cache._n == 50
+    assert cache.lookup("question number 499 about credit cards") == "answer 499"
+
+
+def test_rebuild_drops_stale_bucket_references():
+    cache = SemanticCache(capacity=50)
+    for i in range(500):
+        cache.add(f"question number {i} about credit cards", f"answer {i}")
+    cache.compact()
+    refs = sum(len(rows) for table in cache._buckets for rows in table.values())
+    assert refs == len(cache) * cache._tables
+    assert cache.lookup("question number 498 about credit cards") == "answer 498"
@@ -0,0 +1,48 @@
+from chat_history import ChatHistory
+from sessions import SessionRegistry
+from state import SQLiteBackend, StateStore
+
+
+def _session(registry, state, chat):
+    session = registry.touch(state, "sid")
+    state["chat"] = chat
+    registry.own(session, chat)
+    registry.touch(state, "sid")  # measure with the chat in place
+    return session
+
+
+def _chat(store=None):
+    chat = ChatHistory(store=store, key="sid")
+    for i in range(30):
+        chat.append("You", f"question {i} " * 10)
+    return chat
+
+
+def test_evict_frees_the_chat_for_good():
+    registry, state = SessionRegistry(idle_ttl=0, sample_every=0, policy="evict"), {}
+    session = _session(registry, state, _chat())
+    assert session.nbytes > 0
+    stats = registry.sweep()
+    assert stats["released"]["idle"] == 1
+    assert stats["bytes"] == stats["stored_bytes"] == 0
+    assert len(state["chat"]) == 0
+
+
+def test_spill_reports_what_the_backend_still_holds_and_reloads(tmp_path):
+    store = StateStore(SQLiteBackend(str(tmp_path / "state.db")))
+    registry, state = SessionRegistry(idle_ttl=0, sample_every=0, policy="spill"), {}
+    session = _session(registry, state, _chat(store))
+    held = session.nbytes
+    stats = registry.sweep()
+    assert stats["bytes"] == 0 and stats["stored_bytes"] == held
+    registry.idle_ttl = 3600
+    registry.touch(state, "sid")
+    assert "chat" not in state  # recreated by the app, which reloads it from the store
+    assert len(ChatHistory(store=store, key="sid")) == 30
+    assert registry.stats()["stored_bytes"] == 0
+
+
+def test_start_runs_one_sweeper_however_often_it_is_called():
+    registry = SessionRegistry()
+    first = registry.start(3600)
+    assert registry.start(3600) is first and first.is_alive()
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def _run_concurrently(n, target):
+    results, errors = [None] * n, [None] * n
+    start = threading.Barrier(n)
+
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results, errors
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    flight, calls = SingleFlight(), []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return "answer"
+
+    results, errors = _run_concurrently(8, lambda: flight.do("k", fn, timeout=5))
+    assert results == ["answer"] * 8
+    assert errors == [None] * 8
+    assert len(calls) == 1
+
+
+def test_waiters_get_the_leaders_error():
+    flight = SingleFlight()
+
+    def fn():
+        time.sleep(0.1)
+        raise ValueError("upstream failed")
+
+    _, errors = _run_concurrently(4, lambda: flight.do("k", fn, timeout=5))
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_key_is_free_again_after_the_call():
+    flight, calls = SingleFlight(), []
+    for _ in range(3):
+        flight.do("k", lambda: calls.append(1))
+    assert len(calls) == 3
+
+
+def test_waiter_times_out():
+    flight = SingleFlight()
+    call, leader = flight.begin("k")
+    assert leader
+    waiting, leader = flight.begin("k")
+    assert not leader and waiting is call
+    with pytest.raises(TimeoutError):
+        flight.wait(waiting, timeout=0.05)
+    flight.finish("k", call, result="late")
+    assert flight.wait(waiting, timeout=1) == "late"
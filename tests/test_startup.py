@@ -0,0 +1,22 @@
+import sys
+import threading
+
+import startup
+
+
+def test_load_imports_and_inits_once(tmp_path, monkeypatch):
+    (tmp_path / "startup_probe.py").write_text("import json\ninits = []\n\ndef init():\n    inits.append(1)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "startup_probe", raising=False)
+    loaded = []
+    threads = [
+        threading.Thread(target=lambda: startup.load("startup_probe", on_load=lambda m, s: loaded.append(s)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    module, stages = startup.load("startup_probe")
+    assert module.inits == [1]
+    assert loaded == [stages] and set(stages) == {"import", "init"}
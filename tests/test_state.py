@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from answer_cache import AnswerCache
+from chat_history import ChatHistory
+from state import MemoryBackend, SQLiteBackend, StateStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    return MemoryBackend() if request.param == "memory" else SQLiteBackend(str(tmp_path / "state.db"))
+
+
+def test_writes_are_visible_after_flush(backend):
+    store = StateStore(backend, flush_interval=60)
+    store.set("answers", "k", "v")
+    assert store.get("answers", "k") == "v"  # read through the local cache before the flush
+    store.flush()
+    assert backend.get("answers", "k") == "v"
+    store.append("chat", "s", "a")
+    store.append("chat", "s", "b")
+    assert store.range("chat", "s") == ["a", "b"]  # range() flushes queued appends first
+    store.delete("chat", "s")
+    store.flush()
+    assert backend.range("chat", "s") == []
+
+
+def test_list_is_capped(backend):
+    backend.apply([("append", "chat", "s", str(i), 3, None) for i in range(10)])
+    assert backend.range("chat", "s") == ["7", "8", "9"]
+
+
+def test_token_bucket_allows_a_burst_then_refills(backend):
+    # 5 tokens, refilled at 50 per second
+    assert [backend.take("rate", "s", 50, 5, 1) for _ in range(7)] == [True] * 5 + [False] * 2
+    time.sleep(0.03)  # ~1.5 tokens back
+    assert [backend.take("rate", "s", 50, 5, 1) for _ in range(2)] == [True, False]
+
+
+def test_token_bucket_has_no_window_boundary_and_ignores_rejected_attempts(backend):
+    # A fixed window lets 2 x burst through around its boundary; the bucket only gives back what has refilled
+    start = time.time()
+    admitted = 0
+    while time.time() - start < 0.25:
+        admitted += backend.take("rate", "s", 10, 5, 1)
+    assert admitted == 7  # 5 up front, 2 refilled over 0.25 s
+    # Hammering it while empty did not push the next token further away
+    time.sleep(0.1)
+    assert backend.take("rate", "s", 10, 5, 1)
+
+
+def test_purge_drops_expired_keys_and_lists(backend):
+    past, future = time.time() - 1, time.time() + 60
+    backend.apply([
+        ("set", "answers", "old", "v", past),
+        ("set", "answers", "new", "v", future),
+        ("set", "answers", "forever", "v", None),
+        ("append", "chat", "old", "turn", None, past),
+        ("append", "chat", "new", "turn", None, future),
+    ])
+    backend.take("rate", "s", 1000, 5, 1)  # full again, and so expired, after 5 ms
+    time.sleep(0.02)
+    assert backend.range("chat", "old") == []
+    assert backend.purge() == 3
+    assert backend.get("answers", "new") == backend.get("answers", "forever") == "v"
+    assert backend.range("chat", "new") == ["turn"]
+    assert backend.purge() == 0
+
+
+def test_chat_history_reloads_from_a_shared_store(tmp_path):
+    store = StateStore(SQLiteBackend(str(tmp_path / "state.db")))
+    chat = ChatHistory(store=store, key="s", ttl=60)
+    chat.append("You", "hi")
+    chat.append("AI", "hello")
+    assert [tuple(t) for t in ChatHistory(store=store, key="s").recent(5)] == [("You", "hi"), ("AI", "hello")]
+
+
+def test_answer_cache_reads_through_to_the_store(tmp_path):
+    store = StateStore(SQLiteBackend(str(tmp_path / "state.db")))
+    AnswerCache(store=store).set("k", "answer")
+    store.flush()
+    other = AnswerCache(store=store)
+    assert other.get("k") == "answer"
+    assert other.stats()["entries"] == 1
+    assert AnswerCache(ttl=60, store=store).get("missing") is None